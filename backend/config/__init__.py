@@ -1 +1 @@
-from .settings import settings
+from .settings import Settings, get_settings
@@ -1,24 +1,45 @@
 import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+
 from dotenv import load_dotenv
 
-load_dotenv()
+_DOTENV_LOADED = False
+
+
+def _ensure_env():
+    """Parse .env at most once per process, even if the settings cache is cleared."""
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        load_dotenv()
+        _DOTENV_LOADED = True
+
+
+def _as_bool(value: str) -> bool:
+    return value.strip().lower() not in ("", "0", "false", "no", "off")
+
+
+def _env(name: str, default: str = "", cast=str):
+    """Dataclass field read from the environment when Settings() is built."""
+    return field(default_factory=lambda: cast(os.getenv(name, default)))
 
 
+@dataclass(frozen=True)
 class Settings:
     # API Keys
-    DEEPGRAM_API_KEY: str = os.getenv("DEEPGRAM_API_KEY", "")
-    SARVAM_API_KEY: str = os.getenv("SARVAM_API_KEY", "")
-    GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")  # Optional: used for fast event classification
+    DEEPGRAM_API_KEY: str = _env("DEEPGRAM_API_KEY")
+    SARVAM_API_KEY: str = _env("SARVAM_API_KEY")
+    GROQ_API_KEY: str = _env("GROQ_API_KEY")  # Optional: fallback event classification
 
     # Redis
-    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
+    REDIS_URL: str = _env("REDIS_URL", "redis://localhost:6379")
 
     # Server
-    HOST: str = os.getenv("HOST", "0.0.0.0")
-    PORT: int = int(os.getenv("PORT", "8000"))
+    HOST: str = _env("HOST", "0.0.0.0")
+    PORT: int = _env("PORT", "8000", cast=int)
 
     # YouTube
-    YOUTUBE_STREAM_URL: str = os.getenv("YOUTUBE_STREAM_URL", "")
+    YOUTUBE_STREAM_URL: str = _env("YOUTUBE_STREAM_URL")
 
     # Audio settings
     AUDIO_CHUNK_DURATION: int = 5  # seconds
@@ -26,6 +47,7 @@ class Settings:
     AUDIO_FORMAT: str = "mp3"
 
     # TTS settings (Sarvam Bulbul)
+    TTS_PROVIDER: str = _env("TTS_PROVIDER", "sarvam")  # TTS backend; see services.text_to_speech.TTS_PROVIDERS
     TTS_SPEAKER: str = "abhilash"  # Male voice on Bulbul v2 (anushka/abhilash/manisha/vidya/arya/karun/hitesh)
     TTS_MODEL: str = "bulbul:v2"
     TTS_LANGUAGE: str = "te-IN"
@@ -36,11 +58,15 @@ class Settings:
     LLM_MAX_TOKENS: int = 500
     LLM_TEMPERATURE: float = 0.7
 
-    # Classification LLM settings (fast small model — Groq if available, else Sarvam-m)
+    # Fallback classification LLM settings (fast small model on Groq, for untagged replies)
     CLASSIFY_MODEL: str = "llama-3.1-8b-instant"  # Groq fast model for event type labelling
 
     # Dataset collection
-    DATASET_COLLECTION: bool = True  # Enable/disable dataset logging
+    DATASET_COLLECTION: bool = _env("DATASET_COLLECTION", "true", cast=_as_bool)  # Enable/disable dataset logging
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load .env and build Settings once; later calls return the cached instance."""
+    _ensure_env()
+    return Settings()
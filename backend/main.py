@@ -1,15 +1,17 @@
 import asyncio
-import base64
 import logging
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+import msgspec
+import orjson
+import pybase64
 import socketio
-import uvicorn
 
-from config import settings
-from pipeline import CommentaryPipeline
+from config import get_settings
+from utils.leaderboard import diff_leaderboard
 
 # Configure logging
 logging.basicConfig(
@@ -17,12 +19,41 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the pipeline and start background broadcast tasks before serving."""
+    global _audio_batch_task
+    # Imported here so the services stack loads at startup, not on `import main`
+    from pipeline import CommentaryPipeline
+
+    app.state.pipeline = CommentaryPipeline(
+        broadcast_audio_fn=broadcast_audio_chunk,
+        broadcast_leaderboard_fn=broadcast_leaderboard,
+        broadcast_commentary_fn=broadcast_commentary_text,
+    )
+    await app.state.pipeline.warmup()
+    pipeline_worker = asyncio.create_task(app.state.pipeline.worker())
+    _audio_batch_task = asyncio.create_task(_audio_batch_loop())
+
+    yield
+
+    pipeline_worker.cancel()
+    _audio_batch_task.cancel()
+    if app.state.pipeline._running:
+        app.state.pipeline.stop()
+    await app.state.pipeline.aclose()
+
 
 # Initialize FastAPI
 app = FastAPI(
     title="Telugu F1 Live Commentary",
     description="Real-time Telugu commentary for Formula 1 races",
     version="2.2.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS
@@ -34,12 +65,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+class _OrjsonCodec:
+    """json-module stand-in so Socket.IO packets are encoded with orjson.
+
+    python-socketio calls dumps(obj, separators=...) and expects str back;
+    orjson is always compact, so extra kwargs are ignored.
+    """
+
+    @staticmethod
+    def dumps(obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    @staticmethod
+    def loads(data, **kwargs):
+        return orjson.loads(data)
+
+
 # Initialize Socket.IO
-sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="*")
+sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="*", json=_OrjsonCodec)
 socket_app = socketio.ASGIApp(sio, other_asgi_app=app)
 
-# Track active connections
-active_connections: set[str] = set()
+# Serialized once: orjson splices a Fragment's bytes verbatim into each packet
+_GREETING = orjson.Fragment(
+    orjson.dumps({"status": "connected", "message": "తెలుగు కామెంటరీకి స్వాగతం!"})
+)
+
+# Every client joins this room on connect; all broadcasts target it
+LISTENERS_ROOM = "listeners"
+
+
+def _listener_count() -> int:
+    """Number of connected clients, read from Socket.IO's own room tracking."""
+    return len(sio.manager.rooms.get("/", {}).get(LISTENERS_ROOM, {}))
 
 
 @app.get("/")
@@ -47,51 +105,111 @@ async def root():
     return {
         "service": "Telugu F1 Live Commentary",
         "status": "running",
-        "active_connections": len(active_connections),
+        "active_connections": _listener_count(),
     }
 
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "active_connections": _listener_count()}
 
 
 @sio.event
 async def connect(sid, environ):
     logger.info(f"Client connected: {sid}")
-    active_connections.add(sid)
-    await sio.emit(
-        "race_state",
-        {
-            "status": "connected",
-            "message": "తెలుగు కామెంటరీకి స్వాగతం!",
-        },
-        room=sid,
-    )
+    await sio.enter_room(sid, LISTENERS_ROOM)
+    await sio.emit("race_state", _GREETING, room=sid)
+    # New clients get a full snapshot; everyone else only receives patches
+    if _last_leaderboard:
+        await sio.emit("leaderboard_update", _last_leaderboard, room=sid)
 
 
 @sio.event
 async def disconnect(sid):
     logger.info(f"Client disconnected: {sid}")
-    active_connections.discard(sid)
+
+
+# Audio chunks that arrive close together are coalesced into one emit
+AUDIO_BATCH_MAX_CHUNKS = 8
+AUDIO_BATCH_WINDOW = 0.075  # seconds to linger for more chunks once a backlog forms
+
+_audio_queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=32)
+_audio_batch_task: asyncio.Task | None = None
 
 
 async def broadcast_audio_chunk(audio_data: bytes):
-    """Broadcast Telugu audio to all connected clients."""
-    b64 = base64.b64encode(audio_data).decode("utf-8")
-    logger.info(
-        f"Broadcasting audio_chunk to {len(active_connections)} clients "
-        f"({len(audio_data)} bytes, {len(b64)} b64 chars)"
-    )
-    await sio.emit(
-        "audio_chunk",
-        {"audio": b64},
-    )
+    """Queue Telugu audio for broadcast to all connected clients.
+
+    The raw bytes are sent as a Socket.IO binary attachment, so there is no
+    base64 step and no 33% payload inflation. The bounded queue applies
+    backpressure to the pipeline if emits fall behind.
+    """
+    await _audio_queue.put(audio_data)
+
+
+async def _collect_audio_batch() -> list[bytes]:
+    """Wait for the next chunk, then gather whatever is queued behind it.
+
+    A lone chunk is flushed immediately so live audio isn't delayed; once a
+    backlog exists we linger up to AUDIO_BATCH_WINDOW to fill the batch.
+    """
+    batch = [await _audio_queue.get()]
+    if _audio_queue.empty():
+        return batch
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + AUDIO_BATCH_WINDOW
+    while len(batch) < AUDIO_BATCH_MAX_CHUNKS:
+        if not _audio_queue.empty():
+            batch.append(_audio_queue.get_nowait())
+            continue
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(_audio_queue.get(), remaining))
+        except asyncio.TimeoutError:
+            break
+    return batch
+
+
+async def _audio_batch_loop():
+    """Drain the audio queue, sending one Socket.IO emit per batch."""
+    while True:
+        batch = await _collect_audio_batch()
+        # Sizes and client count are only worth computing if the line is emitted
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Broadcasting %d audio chunk(s) to %d clients (%d bytes)",
+                len(batch), _listener_count(), sum(len(c) for c in batch),
+            )
+        try:
+            if len(batch) == 1:
+                await sio.emit("audio_chunk", batch[0], room=LISTENERS_ROOM)
+            else:
+                await sio.emit("audio_chunks_batch", batch, room=LISTENERS_ROOM)
+        except Exception as e:
+            logger.error(f"Audio broadcast error: {e}")
+
+
+# Last leaderboard sent, used to diff successive updates
+_last_leaderboard: dict = {}
 
 
 async def broadcast_leaderboard(leaderboard_data: dict):
-    """Broadcast leaderboard updates to all connected clients."""
-    await sio.emit("leaderboard_update", leaderboard_data)
+    """Broadcast leaderboard updates to all connected clients.
+
+    The first update goes out as a full ``leaderboard_update``; after that only
+    a ``leaderboard_patch`` with the changes is sent, and nothing if unchanged.
+    """
+    global _last_leaderboard
+    if not _last_leaderboard:
+        await sio.emit("leaderboard_update", leaderboard_data, room=LISTENERS_ROOM)
+    else:
+        patch = diff_leaderboard(_last_leaderboard, leaderboard_data)
+        if patch:
+            await sio.emit("leaderboard_patch", patch, room=LISTENERS_ROOM)
+    _last_leaderboard = leaderboard_data
 
 
 async def broadcast_commentary_text(english: str, telugu: str):
@@ -99,6 +217,7 @@ async def broadcast_commentary_text(english: str, telugu: str):
     await sio.emit(
         "commentary_text",
         {"english": english, "telugu": telugu},
+        room=LISTENERS_ROOM,
     )
 
 
@@ -107,62 +226,82 @@ async def broadcast_race_event(event_type: str, event_data: dict):
     await sio.emit(
         "race_event",
         {"type": event_type, "data": event_data},
+        room=LISTENERS_ROOM,
     )
 
 
-# Initialize pipeline
-pipeline = CommentaryPipeline(
-    broadcast_audio_fn=broadcast_audio_chunk,
-    broadcast_leaderboard_fn=broadcast_leaderboard,
-    broadcast_commentary_fn=broadcast_commentary_text,
-)
+async def _decode_body(http_request: Request, body_type: type):
+    """Decode and validate a JSON request body with msgspec (422 on bad input)."""
+    try:
+        return msgspec.json.decode(await http_request.body(), type=body_type)
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def _json_body(body_type: type) -> dict:
+    """``openapi_extra`` documenting a body read with _decode_body.
 
+    FastAPI can't see bodies decoded by hand, so without this /docs shows no
+    request schema. The bodies are flat structs, so their schema is inlined.
+    """
+    _, components = msgspec.json.schema_components((body_type,))
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": components[body_type.__name__]}},
+        }
+    }
 
-class TestCommentaryRequest(BaseModel):
+
+class TestCommentaryRequest(msgspec.Struct):
     english_text: str
 
 
-@app.post("/api/test/translate")
-async def test_translate(request: TestCommentaryRequest):
+@app.post("/api/test/translate", openapi_extra=_json_body(TestCommentaryRequest))
+async def test_translate(http_request: Request):
     """Test endpoint: translate English text to Telugu commentary + audio.
 
     Use this to test the translation + TTS pipeline without needing
     a live YouTube stream or STT.
     """
+    request = await _decode_body(http_request, TestCommentaryRequest)
+    pipeline = app.state.pipeline
     result = await pipeline.test_translation_only(request.english_text)
-    return {
+    # Returned directly so FastAPI skips jsonable_encoder on the large base64 string
+    return ORJSONResponse({
         "english": result["english"],
         "telugu": result["telugu"],
         "audio_size_bytes": result["audio_size_bytes"],
-        "audio_base64": base64.b64encode(result["audio"]).decode("utf-8"),
-    }
+        "audio_base64": pybase64.b64encode_as_string(result["audio"]),
+    })
 
 
-@app.post("/api/test/broadcast")
-async def test_broadcast(request: TestCommentaryRequest):
+@app.post("/api/test/broadcast", openapi_extra=_json_body(TestCommentaryRequest))
+async def test_broadcast(http_request: Request):
     """Test endpoint: translate + TTS + broadcast via WebSocket.
 
     Use this to test the full frontend audio playback without YouTube.
     """
-    result = await pipeline.test_translation_only(request.english_text)
-    await broadcast_commentary_text(result["english"], result["telugu"])
-    await broadcast_audio_chunk(result["audio"])
+    request = await _decode_body(http_request, TestCommentaryRequest)
+    pipeline = app.state.pipeline
+    # Audio goes out sentence by sentence instead of as one whole-text clip
+    result = await pipeline.test_broadcast(request.english_text)
     return {
         "english": result["english"],
         "telugu": result["telugu"],
         "audio_size_bytes": result["audio_size_bytes"],
         "broadcast": True,
-        "connected_clients": len(active_connections),
+        "connected_clients": _listener_count(),
     }
 
 
-class StartStreamRequest(BaseModel):
+class StartStreamRequest(msgspec.Struct):
     youtube_url: str
     race_name: str | None = None  # e.g. "2025-bahrain-gp"
 
 
-@app.post("/api/start")
-async def start_pipeline(request: StartStreamRequest):
+@app.post("/api/start", openapi_extra=_json_body(StartStreamRequest))
+async def start_pipeline(http_request: Request):
     """Start the streaming commentary pipeline from a YouTube URL.
 
     Works with both live streams and regular videos.
@@ -170,19 +309,15 @@ async def start_pipeline(request: StartStreamRequest):
     Audio chunks are broadcast to all connected frontend clients via WebSocket.
     Race context (OpenF1 leaderboard) refreshes automatically every 10 seconds.
     """
-    global pipeline
+    request = await _decode_body(http_request, StartStreamRequest)
+    pipeline = app.state.pipeline
     if pipeline._running:
         return {"error": "Pipeline already running. Call /api/stop first."}
 
-    # Create a fresh pipeline with the race name for dataset tagging
-    pipeline = CommentaryPipeline(
-        broadcast_audio_fn=broadcast_audio_chunk,
-        broadcast_leaderboard_fn=broadcast_leaderboard,
-        broadcast_commentary_fn=broadcast_commentary_text,
-        race_name=request.race_name,
-    )
+    # Reuse the pipeline (and its warmed services); only the race name changes
+    pipeline.reset(race_name=request.race_name)
 
-    asyncio.create_task(pipeline.run_live(request.youtube_url))
+    pipeline.start(request.youtube_url)
     return {
         "status": "started",
         "youtube_url": request.youtube_url,
@@ -194,6 +329,7 @@ async def start_pipeline(request: StartStreamRequest):
 @app.post("/api/stop")
 async def stop_pipeline():
     """Stop the running pipeline and finalize dataset collection."""
+    pipeline = app.state.pipeline
     stats = pipeline.dataset_collector.get_stats() if pipeline._dataset_collector else {}
     pipeline.stop()
     return {"status": "stopped", "dataset_stats": stats}
@@ -202,6 +338,7 @@ async def stop_pipeline():
 @app.get("/api/dataset/stats")
 async def dataset_stats():
     """Get current dataset collection stats."""
+    pipeline = app.state.pipeline
     if pipeline._dataset_collector:
         return pipeline.dataset_collector.get_stats()
     return {"message": "No active dataset collection"}
@@ -210,6 +347,7 @@ async def dataset_stats():
 @app.get("/api/race/context")
 async def race_context():
     """Get current race context from OpenF1 (leaderboard + session info)."""
+    pipeline = app.state.pipeline
     if pipeline._race_context:
         return {
             "leaderboard": pipeline.race_context.get_leaderboard(),
@@ -219,4 +357,6 @@ async def race_context():
 
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(socket_app, host=settings.HOST, port=settings.PORT)
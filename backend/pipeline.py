@@ -1,13 +1,94 @@
 import asyncio
+import gc
 import logging
+from functools import lru_cache
 
+import httpx
+from groq import AsyncGroq
+
+from config import get_settings
 from services.audio_capture import YouTubeAudioCapture, AudioFileCapture
 from services.speech_to_text import BatchSpeechToText
 from services.dataset_collector import DatasetCollector
-from services.text_to_speech import TeluguTTSService
+from services.text_to_speech import TeluguTTSService, make_tts_service
 from services.race_context import RaceContextEngine
+from utils.lru import LRUCache
+from utils.text import commentary_key, split_sentences
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+STAGE_QUEUE_SIZE = 2  # chunks / lines buffered between live pipeline stages
+TTS_QUEUE_SIZE = 8  # sentences awaiting broadcast (a line can be several)
+LEADERBOARD_MIN_INTERVAL = 2.0  # seconds between leaderboard pushes
+TRANSLATION_CONCURRENCY = 3  # LLM calls allowed in flight at once
+
+TRANSLATION_CACHE_SIZE = 512
+TTS_CACHE_SIZE = 256
+TTS_CACHE_MAX_BYTES = 64 * 1024 * 1024  # keep cached audio under ~64 MB
+
+
+# Process-wide service singletons. Built on first use and shared by every
+# pipeline run, so warmed clients survive /api/start → /api/stop cycles.
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.AsyncClient:
+    """Pooled HTTP/2 client shared by the Sarvam TTS/LLM and Groq calls.
+
+    Keep-alive connections skip a TCP + TLS handshake per request, and HTTP/2
+    multiplexes concurrent translation and TTS requests over one connection.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=32),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_stt_service() -> BatchSpeechToText:
+    return BatchSpeechToText()
+
+
+@lru_cache(maxsize=1)
+def get_tts_service() -> TeluguTTSService:
+    return make_tts_service(http_client=get_http_client())
+
+
+@lru_cache(maxsize=1)
+def get_groq_client() -> AsyncGroq:
+    """Groq client for fallback classification, on the shared HTTP pool."""
+    return AsyncGroq(api_key=settings.GROQ_API_KEY, http_client=get_http_client())
+
+
+def new_dataset_collector(race_name: str | None = None) -> DatasetCollector:
+    """A fresh collector for one run; only its HTTP and Groq clients are shared.
+
+    Collectors hold per-race stats and an open dataset file, so unlike the
+    services above they are never reused across runs.
+    """
+    return DatasetCollector(
+        race_name=race_name,
+        http_client=get_http_client(),
+        groq_client=get_groq_client(),
+    )
+
+
+def _put_latest(queue: asyncio.Queue, item, what: str):
+    """Enqueue without blocking, dropping the oldest item if the queue is full.
+
+    A stalled stage then costs stale commentary rather than pushing everything
+    behind it further and further out of sync with the video. Dropped TTS
+    tasks are cancelled.
+    """
+    try:
+        queue.put_nowait(item)
+    except asyncio.QueueFull:
+        stale = queue.get_nowait()
+        if isinstance(stale, asyncio.Task):
+            stale.cancel()
+        queue.put_nowait(item)
+        logger.warning("Dropped stale %s (pipeline lagging)", what)
 
 
 class CommentaryPipeline:
@@ -35,25 +116,47 @@ class CommentaryPipeline:
         self._tts_service = None
         self._race_context = None
 
+        # Live commentary repeats itself ("box box", "DRS enabled", driver names),
+        # so identical lines reuse earlier translation and TTS results.
+        # Translations map a digest of the normalized English line to
+        # (event_type, telugu), filler verdicts included, and are dropped when
+        # the leader changes, since they are context-dependent.
+        self._translation_cache = LRUCache(TRANSLATION_CACHE_SIZE)
+        self._cache_leader = None
+        self._tts_cache = LRUCache(
+            TTS_CACHE_SIZE,
+            max_bytes=TTS_CACHE_MAX_BYTES,
+            sizeof=lambda parts: sum(len(p) for p in parts),
+        )
+
+        # Bounds parallel LLM calls; a slow completion no longer holds up the
+        # lines behind it. Identical lines already in flight share one call.
+        self._translate_slots = asyncio.Semaphore(TRANSLATION_CONCURRENCY)
+        self._translations_inflight: dict[bytes, asyncio.Task] = {}
+
         self._running = False
         self._capture = None
 
+        # A single long-lived worker runs streams queued by start()
+        self._url_queue: asyncio.Queue[str] = asyncio.Queue()
+        self._run_task: asyncio.Task | None = None
+
     @property
     def stt_service(self):
         if self._stt_service is None:
-            self._stt_service = BatchSpeechToText()
+            self._stt_service = get_stt_service()
         return self._stt_service
 
     @property
     def dataset_collector(self):
         if self._dataset_collector is None:
-            self._dataset_collector = DatasetCollector(race_name=self.race_name)
+            self._dataset_collector = new_dataset_collector(self.race_name)
         return self._dataset_collector
 
     @property
     def tts_service(self):
         if self._tts_service is None:
-            self._tts_service = TeluguTTSService()
+            self._tts_service = get_tts_service()
         return self._tts_service
 
     @property
@@ -62,48 +165,199 @@ class CommentaryPipeline:
             self._race_context = RaceContextEngine()
         return self._race_context
 
+    async def warmup(self):
+        """Build the STT, TTS and dataset services up front, concurrently.
+
+        Called from the app lifespan and again at the start of each run (the
+        dataset collector is per race), so the first chunk doesn't pay for
+        client construction. Constructors run in threads since SDK clients
+        may block while setting up.
+        """
+        # Build the shared HTTP client here, before the threads start: the
+        # TTS and dataset constructors both fetch it, and lru_cache isn't
+        # locked, so racing them could create (and leak) a second client
+        get_http_client()
+        get_groq_client()
+        await asyncio.gather(
+            asyncio.to_thread(lambda: self.stt_service),
+            asyncio.to_thread(lambda: self.tts_service),
+            asyncio.to_thread(lambda: self.dataset_collector),
+        )
+        logger.info("Pipeline services warmed up")
+
+    async def worker(self):
+        """Run queued streams one at a time for the lifetime of the app.
+
+        Spawned once at startup; start() enqueues a URL and stop() cancels
+        only the current run, so no task is created or leaked per start call.
+        """
+        while True:
+            youtube_url = await self._url_queue.get()
+            self._run_task = asyncio.create_task(self.run_live(youtube_url))
+            # wait() doesn't raise if the run is cancelled by stop()
+            await asyncio.wait({self._run_task})
+            self._run_task = None
+
+    def start(self, youtube_url: str):
+        """Queue a stream for the worker. Marks the pipeline running immediately."""
+        self._running = True
+        self._url_queue.put_nowait(youtube_url)
+
+    def reset(self, race_name: str | None = None):
+        """Prepare for a new run, keeping the shared service singletons."""
+        self.race_name = race_name
+        # The next run gets a new collector (resolving the default race name
+        # afresh); anything the previous one still holds is written out
+        self._finish_dataset_collector()
+        self._capture = None
+
     async def _start_race_context(self):
         """Start race context engine and begin leaderboard broadcast loop."""
         await self.race_context.start()
         asyncio.create_task(self._leaderboard_broadcast_loop())
 
     async def _leaderboard_broadcast_loop(self):
-        """Push leaderboard updates to frontend every 10 seconds."""
+        """Push the leaderboard to the frontend whenever it changes.
+
+        Pushes are spaced at least LEADERBOARD_MIN_INTERVAL apart; changes in
+        between are coalesced into the next push.
+        """
         while self._running:
+            await self.race_context.wait_for_leaderboard_change()
+            if not self._running:
+                break
             leaderboard = self.race_context.get_leaderboard()
+            if leaderboard:
+                self._check_leader(leaderboard)
             if leaderboard and self.broadcast_leaderboard:
                 await self.broadcast_leaderboard(leaderboard)
-                # Keep dataset collector context in sync
+                # Keep dataset collector context in sync (off the loop, so
+                # broadcasts never wait on collector work)
                 if self._dataset_collector:
-                    self._dataset_collector.update_race_context(leaderboard)
-            await asyncio.sleep(10)
+                    await asyncio.to_thread(
+                        self._dataset_collector.update_race_context, leaderboard
+                    )
+            await asyncio.sleep(LEADERBOARD_MIN_INTERVAL)
+
+    def _check_leader(self, leaderboard: dict):
+        """Invalidate cached translations when the race leader changes."""
+        positions = leaderboard.get("positions")
+        leader = positions[0].get("driver_number") if positions else None
+        if leader != self._cache_leader:
+            if self._cache_leader is not None:
+                logger.info("Leader changed, clearing %d cached translations",
+                            len(self._translation_cache))
+                self._translation_cache.clear()
+            self._cache_leader = leader
+
+    async def _translate(self, english_text: str, context: str, on_sentence=None) -> str:
+        """Telugu commentary for a line, served from cache for repeated lines.
+
+        ``on_sentence`` (if given) is called with each Telugu sentence as soon
+        as it is available, ahead of the full text being returned.
+        """
+        key = commentary_key(english_text)
+        # Bound now: stop() may detach the collector while this line waits
+        collector = self.dataset_collector
+        cached = self._translation_cache.get(key)
+        if cached is None:
+            task = self._translations_inflight.get(key)
+            if task is None:
+                task = asyncio.create_task(
+                    self._generate(collector, key, english_text, context, on_sentence)
+                )
+                self._translations_inflight[key] = task
+                task.add_done_callback(
+                    lambda _: self._translations_inflight.pop(key, None)
+                )
+                # Shielded so one cancelled waiter doesn't cancel a call others share
+                _, telugu_text = await asyncio.shield(task)
+                return telugu_text
+            cached = await asyncio.shield(task)
+
+        # Cached or shared with an earlier caller: still count and log the
+        # line (unless the shared call failed), then replay its sentences
+        event_type, telugu_text = cached
+        if event_type:
+            collector.record(english_text, context, event_type, telugu_text)
+        if on_sentence:
+            for sentence in split_sentences(telugu_text):
+                on_sentence(sentence)
+        return telugu_text
+
+    async def _generate(
+        self, collector, key: bytes, english_text: str, context: str, on_sentence
+    ) -> tuple[str, str]:
+        async with self._translate_slots:
+            result = await collector.commentate(
+                english_text, context=context, on_sentence=on_sentence
+            )
+        # Cache real output and filler verdicts. A failed call (no event
+        # type) may have stopped partway, so it is never cached
+        event_type, telugu_text = result
+        if event_type and (telugu_text or event_type == "filler"):
+            self._translation_cache.put(key, result)
+        return result
+
+    async def _synthesize(self, telugu_text: str) -> list[bytes]:
+        """All TTS audio parts for a piece of text."""
+        return [part async for part in self._synthesize_stream(telugu_text)]
+
+    async def _synthesize_stream(self, telugu_text: str):
+        """Yield TTS audio parts as they are synthesized (cached for repeated lines)."""
+        cached = self._tts_cache.get(telugu_text)
+        if cached is not None:
+            for part in cached:
+                yield part
+            return
+
+        parts = []
+        async for part in self.tts_service.synthesize_speech_stream(telugu_text):
+            parts.append(part)
+            yield part
+        self._tts_cache.put(telugu_text, tuple(parts))
+
+    async def _commentate(self, english_text: str) -> str:
+        """English text → Telugu text (broadcast alongside the English). "" for filler."""
+        telugu_text = await self._translate_line(english_text)
+        return await self._publish_text(english_text, telugu_text)
+
+    async def _translate_line(self, english_text: str, on_sentence=None) -> str:
+        """Translate one line with the current race context."""
+        logger.info("Processing: %.80s...", english_text)
+
+        # Inject live race context into the commentary prompt
+        context = self.race_context.get_context_string() if self._race_context else ""
 
-    async def process_sentence(self, english_text: str):
-        """English text → classify → Telugu text (Sarvam-m) → audio (Bulbul) → broadcast"""
-        try:
-            logger.info(f"Processing: {english_text[:80]}...")
+        return await self._translate(english_text, context, on_sentence)
 
-            # Inject live race context into the commentary prompt
-            context = self.race_context.get_context_string() if self._race_context else ""
+    async def _publish_text(self, english_text: str, telugu_text: str) -> str:
+        """Broadcast a translated line; returns the Telugu text, "" for filler."""
+        if not telugu_text:
+            logger.info("Filler detected, skipping TTS/broadcast")
+            return ""
 
-            telugu_text = await self.dataset_collector.generate_telugu_commentary(
-                english_text, context=context
+        # Broadcast text pair (Telugu + English side by side on frontend)
+        if self.broadcast_commentary:
+            await self.broadcast_commentary(
+                english=english_text, telugu=telugu_text
             )
+        return telugu_text
 
-            if not telugu_text:
-                logger.info("Filler detected, skipping TTS/broadcast")
-                return
-
-            # Broadcast text pair (Telugu + English side by side on frontend)
-            if self.broadcast_commentary:
-                await self.broadcast_commentary(
-                    english=english_text, telugu=telugu_text
-                )
-
-            audio_data = await self.tts_service.synthesize_speech(telugu_text)
+    async def _speak(self, telugu_text: str):
+        """Telugu text → audio (Bulbul) → broadcast."""
+        # Broadcast each sentence's audio as soon as it's ready
+        async for audio_data in self._synthesize_stream(telugu_text):
             await self.broadcast_audio(audio_data)
 
-            logger.info("Pipeline cycle complete")
+        logger.info("Pipeline cycle complete")
+
+    async def process_sentence(self, english_text: str):
+        """English text → classify → Telugu text (Sarvam-m) → audio (Bulbul) → broadcast"""
+        try:
+            telugu_text = await self._commentate(english_text)
+            if telugu_text:
+                await self._speak(telugu_text)
 
         except Exception as e:
             logger.error(f"Pipeline error: {e}")
@@ -112,57 +366,189 @@ class CommentaryPipeline:
         """Run the streaming pipeline from a YouTube live stream or video.
 
         Continuously: capture audio → transcribe → translate → TTS → broadcast
+        Each stage runs as its own task joined by bounded queues, so chunk N+1
+        is transcribed while chunk N is being translated or spoken.
         Runs until the stream ends or stop() is called.
         """
         self._running = True
         logger.info(f"Starting live pipeline for: {youtube_url}")
 
-        # Start race context engine in parallel
-        await self._start_race_context()
+        # Read settings once up front rather than per chunk
+        sample_rate = settings.AUDIO_SAMPLE_RATE
 
-        self._capture = YouTubeAudioCapture(youtube_url, chunk_duration=10)
-        chunk_num = 0
+        # Warm services and start the race context engine in parallel, all
+        # before the first chunk arrives
+        await asyncio.gather(self.warmup(), self._start_race_context())
 
-        try:
-            async for chunk in self._capture.get_audio_chunks():
-                if not self._running:
-                    logger.info("Pipeline stopped by user")
-                    break
-
-                chunk_num += 1
-                logger.info(f"Chunk {chunk_num} ({len(chunk)} bytes)")
+        # Everything built so far (SDK clients, prompts, caches) lives for the
+        # whole run; move it out of the collector's reach so GC passes during
+        # streaming only walk per-chunk objects
+        gc.collect()
+        gc.freeze()
 
-                english_text = await self.stt_service.transcribe_audio(chunk)
-                if not english_text.strip():
-                    logger.info(f"Chunk {chunk_num}: no speech detected, skipping")
-                    continue
+        self._capture = YouTubeAudioCapture(
+            youtube_url, chunk_duration=10, sample_rate=sample_rate
+        )
 
-                logger.info(f"Chunk {chunk_num} EN: {english_text[:80]}...")
-                await self.process_sentence(english_text)
+        # Bounded queues that drop their oldest item when full, keeping the
+        # commentary live under a stall; None marks end of stream
+        stt_q = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+        llm_q = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+        tts_q = asyncio.Queue(maxsize=TTS_QUEUE_SIZE)
+        stages = [
+            asyncio.create_task(self._capture_stage(stt_q)),
+            asyncio.create_task(self._stt_stage(stt_q, llm_q, sample_rate)),
+            asyncio.create_task(self._translate_stage(llm_q, tts_q)),
+            asyncio.create_task(self._tts_stage(tts_q)),
+        ]
 
+        try:
+            chunk_num, *_ = await asyncio.gather(*stages)
             logger.info(f"Pipeline finished after {chunk_num} chunks")
 
         except Exception as e:
             logger.error(f"Live pipeline error: {e}")
         finally:
+            for stage in stages:
+                stage.cancel()
+            gc.unfreeze()
             self._running = False
+            self._cancel_translations()
+            self._finish_dataset_collector()
             if self._capture:
                 await self._capture.stop()
 
+    async def _capture_stage(self, out_q: asyncio.Queue) -> int:
+        """Feed captured audio chunks to the STT stage. Returns the chunk count."""
+        chunk_num = 0
+        async for chunk in self._capture.get_audio_chunks():
+            if not self._running:
+                logger.info("Pipeline stopped by user")
+                break
+
+            chunk_num += 1
+            logger.info("Chunk %d (%d bytes)", chunk_num, len(chunk.pcm))
+            _put_latest(out_q, (chunk_num, chunk), "audio chunk")
+
+        await out_q.put(None)
+        return chunk_num
+
+    async def _stt_stage(self, in_q: asyncio.Queue, out_q: asyncio.Queue, sample_rate: int):
+        """Transcribe chunks and pass non-empty English text on."""
+        while True:
+            item = await in_q.get()
+            if item is None:
+                break
+            chunk_num, chunk = item
+            if chunk.is_silent:
+                logger.info("Chunk %d: VAD found no speech, skipping STT", chunk_num)
+                continue
+
+            english_text = await self.stt_service.transcribe_audio(
+                chunk.pcm, sample_rate
+            )
+            if not english_text:
+                logger.info("Chunk %d: no speech detected, skipping", chunk_num)
+                continue
+
+            logger.info("Chunk %d EN: %.80s...", chunk_num, english_text)
+            _put_latest(out_q, english_text, "transcript")
+
+        await out_q.put(None)
+
+    async def _translate_stage(self, in_q: asyncio.Queue, out_q: asyncio.Queue):
+        """Translate English text and pass TTS tasks for its Telugu sentences on.
+
+        Up to TRANSLATION_CONCURRENCY lines are translated at once; results
+        are published strictly in arrival order.
+        """
+        pending = asyncio.Queue(maxsize=TRANSLATION_CONCURRENCY)
+        publisher = asyncio.create_task(self._publish_stage(pending, out_q))
+        try:
+            while True:
+                english_text = await in_q.get()
+                if english_text is None:
+                    break
+                # Sentences stream into a per-line queue; None marks the end
+                sentences = asyncio.Queue()
+                task = asyncio.create_task(
+                    self._translate_line(english_text, sentences.put_nowait)
+                )
+                task.add_done_callback(lambda _, q=sentences: q.put_nowait(None))
+                await pending.put((english_text, sentences, task))
+
+            await pending.put(None)
+            await publisher
+        finally:
+            publisher.cancel()
+            while not pending.empty():
+                item = pending.get_nowait()
+                if item is not None:
+                    item[-1].cancel()
+
+    async def _publish_stage(self, in_q: asyncio.Queue, out_q: asyncio.Queue):
+        """Take translations in order and start TTS on each sentence as it lands.
+
+        Synthesis of a line's first sentence overlaps generation of the rest.
+        """
+        while True:
+            item = await in_q.get()
+            if item is None:
+                break
+            english_text, sentences, task = item
+            while True:
+                sentence = await sentences.get()
+                if sentence is None:
+                    break
+                _put_latest(
+                    out_q, asyncio.create_task(self._synthesize(sentence)), "TTS sentence"
+                )
+            try:
+                await self._publish_text(english_text, await task)
+            except Exception as e:
+                logger.error(f"Pipeline error: {e}")
+
+        await out_q.put(None)
+
+    async def _tts_stage(self, in_q: asyncio.Queue):
+        """Broadcast Telugu audio in order as each sentence's synthesis finishes."""
+        try:
+            while True:
+                task = await in_q.get()
+                if task is None:
+                    break
+                try:
+                    parts = await task
+                except Exception as e:
+                    logger.error(f"Pipeline error: {e}")
+                    continue
+                for audio_data in parts:
+                    await self.broadcast_audio(audio_data)
+        finally:
+            while not in_q.empty():
+                task = in_q.get_nowait()
+                if task is not None:
+                    task.cancel()
+
     async def run_from_file(self, file_path: str):
         """Run the pipeline from a local audio file (for testing)."""
         self._running = True
         logger.info(f"Starting file pipeline for: {file_path}")
 
-        capture = AudioFileCapture(file_path)
+        sample_rate = settings.AUDIO_SAMPLE_RATE
+        capture = AudioFileCapture(file_path, sample_rate=sample_rate)
 
         try:
             async for chunk in capture.get_audio_chunks():
                 if not self._running:
                     break
+                if chunk.is_silent:
+                    continue
 
-                english_text = await self.stt_service.transcribe_audio(chunk)
-                if english_text.strip():
+                english_text = await self.stt_service.transcribe_audio(
+                    chunk.pcm, sample_rate
+                )
+                if english_text:
                     await self.process_sentence(english_text)
 
         except Exception as e:
@@ -173,9 +559,7 @@ class CommentaryPipeline:
     async def test_translation_only(self, english_text: str) -> dict:
         """Test translation + TTS without audio capture or STT."""
         context = self.race_context.get_context_string() if self._race_context else ""
-        telugu_text = await self.dataset_collector.generate_telugu_commentary(
-            english_text, context=context
-        )
+        telugu_text = await self._translate(english_text, context)
         audio_data = b""
         if telugu_text:
             audio_data = await self.tts_service.synthesize_speech(telugu_text)
@@ -188,13 +572,55 @@ class CommentaryPipeline:
             "audio": audio_data,
         }
 
+    async def test_broadcast(self, english_text: str) -> dict:
+        """Test translation + TTS, broadcasting each sentence's audio as it's ready."""
+        telugu_text = await self._commentate(english_text)
+        audio_size = 0
+        if telugu_text:
+            async for audio_data in self._synthesize_stream(telugu_text):
+                audio_size += len(audio_data)
+                await self.broadcast_audio(audio_data)
+
+        return {
+            "english": english_text,
+            "telugu": telugu_text,
+            "audio_size_bytes": audio_size,
+        }
+
+    async def aclose(self):
+        """Close the shared HTTP client. Called once at app shutdown, since the
+        services holding it outlive individual runs."""
+        collector, self._dataset_collector = self._dataset_collector, None
+        if collector is not None:
+            await asyncio.to_thread(collector.finish)
+        if get_http_client.cache_info().currsize:
+            await get_http_client().aclose()
+            get_http_client.cache_clear()
+
     def stop(self):
         """Stop the pipeline and finalize dataset collection."""
         self._running = False
-        if self._capture:
+        # Drop a start() the worker hasn't picked up yet
+        while not self._url_queue.empty():
+            self._url_queue.get_nowait()
+        if self._run_task and not self._run_task.done():
+            self._run_task.cancel()
+        elif self._capture:
             asyncio.create_task(self._capture.stop())
         if self._race_context:
             asyncio.create_task(self._race_context.stop())
-        if self._dataset_collector:
-            self._dataset_collector.finish()
+        self._cancel_translations()
+        self._finish_dataset_collector()
         logger.info("Pipeline stop requested")
+
+    def _cancel_translations(self):
+        """Cancel translations still in flight (shielded, so stopping the
+        stages alone leaves them running)."""
+        for task in list(self._translations_inflight.values()):
+            task.cancel()
+
+    def _finish_dataset_collector(self):
+        """Detach the current dataset collector and finalize it off the loop."""
+        collector, self._dataset_collector = self._dataset_collector, None
+        if collector is not None:
+            asyncio.create_task(asyncio.to_thread(collector.finish))
@@ -1,53 +1,93 @@
 import asyncio
+import concurrent.futures
 import logging
-import struct
 import subprocess
-import tempfile
 import os
+from typing import NamedTuple
+
+import av
+
+from services.vad import is_silent
 
 logger = logging.getLogger(__name__)
 
 
-def wrap_pcm_as_wav(pcm_data: bytes, sample_rate: int = 16000, channels: int = 1, bits_per_sample: int = 16) -> bytes:
-    """Wrap raw PCM data with a valid WAV header."""
-    data_size = len(pcm_data)
-    byte_rate = sample_rate * channels * bits_per_sample // 8
-    block_align = channels * bits_per_sample // 8
-
-    header = struct.pack(
-        "<4sI4s4sIHHIIHH4sI",
-        b"RIFF",
-        36 + data_size,       # file size - 8
-        b"WAVE",
-        b"fmt ",
-        16,                   # fmt chunk size
-        1,                    # PCM format
-        channels,
-        sample_rate,
-        byte_rate,
-        block_align,
-        bits_per_sample,
-        b"data",
-        data_size,
-    )
-    return header + pcm_data
+class AudioChunk(NamedTuple):
+    """A chunk of raw mono s16 PCM, flagged when VAD found (almost) no speech in it."""
+    pcm: bytes
+    is_silent: bool = False
+
+
+def _to_audio_chunk(pcm_data: bytes | bytearray | memoryview, sample_rate: int) -> AudioChunk:
+    # bytes() of a bytes object is the object itself; views are snapshotted
+    return AudioChunk(bytes(pcm_data), is_silent(pcm_data, sample_rate))
+
+
+def _decode_to_pcm_chunks(source, sample_rate: int, chunk_size: int, emit, is_running):
+    """Decode an audio container in-process and emit AudioChunks.
+
+    Blocking — run in a worker thread. ``source`` is anything ``av.open``
+    accepts (a path, a ``pipe:<fd>`` URL or a binary file object); each frame
+    is resampled to mono s16 at ``sample_rate`` and accumulated until
+    ``chunk_size`` bytes.
+    VAD runs here too, keeping it off the event loop.
+
+    Samples are copied straight into one preallocated PCM slot that is
+    reused for every chunk, so the only per-chunk allocation is the final
+    immutable ``bytes`` snapshot the STT upload needs.
+    """
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+    pcm = memoryview(bytearray(chunk_size))
+    filled = 0
+
+    def flush():
+        nonlocal filled
+        emit(_to_audio_chunk(pcm[:filled], sample_rate))
+        filled = 0
+
+    def add(frames):
+        nonlocal filled
+        for out in frames:
+            # Plane buffers can be padded; keep only the real samples
+            samples = memoryview(out.planes[0])[: out.samples * 2]
+            while samples:
+                n = min(len(samples), chunk_size - filled)
+                pcm[filled:filled + n] = samples[:n]
+                filled += n
+                samples = samples[n:]
+                if filled == chunk_size:
+                    flush()
+
+    with av.open(source) as container:
+        for frame in container.decode(audio=0):
+            if not is_running():
+                return
+            add(resampler.resample(frame))
+
+    add(resampler.resample(None))
+    if filled:
+        flush()
 
 
 class YouTubeAudioCapture:
-    """Captures audio from a YouTube live stream using yt-dlp + ffmpeg.
+    """Captures audio from a YouTube live stream using yt-dlp + PyAV.
 
-    Uses a shell pipe: yt-dlp → ffmpeg → raw PCM → WAV-wrapped chunks
+    yt-dlp fetches the audio stream into a pipe; PyAV (libavformat/libavcodec)
+    decodes and resamples it in-process → raw PCM chunks. No shell and
+    no ffmpeg process, so PCM never crosses a second pipe, and libavformat
+    reads the pipe fd itself rather than through a Python file object.
     Works with both live streams and regular videos.
     """
 
-    def __init__(self, youtube_url: str, chunk_duration: int = 10):
+    def __init__(self, youtube_url: str, chunk_duration: int = 10, sample_rate: int = 16000):
         self.youtube_url = youtube_url
         self.chunk_duration = chunk_duration
+        self.sample_rate = sample_rate
         self._process = None
         self._running = False
 
     async def get_audio_chunks(self):
-        """Stream audio from YouTube and yield WAV-wrapped PCM chunks."""
+        """Stream audio from YouTube and yield AudioChunks of raw PCM."""
         self._running = True
 
         yt_dlp_bin = os.path.join(
@@ -57,67 +97,86 @@ class YouTubeAudioCapture:
         if not os.path.exists(yt_dlp_bin):
             yt_dlp_bin = "yt-dlp"
 
-        # Shell pipe: yt-dlp streams audio → ffmpeg converts to raw PCM
-        shell_cmd = (
-            f'{yt_dlp_bin} -f bestaudio -o - --no-playlist --quiet '
-            f'"{self.youtube_url}" | '
-            f'ffmpeg -i pipe:0 -f s16le -acodec pcm_s16le -ar 16000 -ac 1 '
-            f'-loglevel error pipe:1'
-        )
-
         logger.info(f"Starting YouTube audio capture: {self.youtube_url}")
 
-        self._process = await asyncio.create_subprocess_shell(
-            shell_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-
-        logger.info("Audio capture pipeline started (yt-dlp | ffmpeg → PCM)")
-
-        # 16000 samples/sec * 2 bytes/sample * chunk_duration
-        chunk_size = 16000 * 2 * self.chunk_duration
-        buffer = bytearray()
-
-        while self._running:
+        # yt-dlp streams the raw container into a pipe we own; the parent keeps
+        # only the read end, which libavformat reads directly as pipe:<fd>
+        read_fd, write_fd = os.pipe()
+        try:
+            self._process = subprocess.Popen(
+                [yt_dlp_bin, "-f", "bestaudio", "-o", "-", "--no-playlist", "--quiet",
+                 self.youtube_url],
+                stdout=write_fd,
+                stderr=subprocess.DEVNULL,
+            )
+        except BaseException:
+            os.close(read_fd)
+            raise
+        finally:
+            os.close(write_fd)
+
+        logger.info("Audio capture pipeline started (yt-dlp → PyAV → PCM)")
+
+        # sample_rate samples/sec * 2 bytes/sample * chunk_duration
+        sample_rate = self.sample_rate
+        chunk_size = sample_rate * 2 * self.chunk_duration
+
+        # Decoded chunks cross from the decode thread via a small bounded queue
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue(maxsize=4)
+
+        def emit(item):
+            future = asyncio.run_coroutine_threadsafe(chunks.put(item), loop)
+            while self._running:
+                try:
+                    future.result(timeout=1)
+                    return
+                except concurrent.futures.TimeoutError:
+                    continue
+            future.cancel()
+
+        def decode():
             try:
-                data = await asyncio.wait_for(
-                    self._process.stdout.read(4096),
-                    timeout=30.0,
+                _decode_to_pcm_chunks(
+                    f"pipe:{read_fd}", sample_rate, chunk_size,
+                    emit, lambda: self._running,
                 )
-
-                if not data:
+            except Exception as e:
+                # A decode error after stop() is just the pipe being closed
+                if self._running:
+                    logger.error(f"Error decoding audio stream: {e}")
+            finally:
+                os.close(read_fd)
+                emit(None)
+
+        decoder = asyncio.create_task(asyncio.to_thread(decode))
+
+        # A live chunk takes chunk_duration to arrive; allow 30s of silence on top
+        read_timeout = self.chunk_duration + 30.0
+
+        try:
+            while self._running:
+                try:
+                    chunk = await asyncio.wait_for(chunks.get(), timeout=read_timeout)
+                except asyncio.TimeoutError:
+                    logger.warning("Audio read timeout, stream may have ended")
+                    break
+                if chunk is None:
                     logger.info("Audio stream ended")
                     break
-
-                buffer.extend(data)
-
-                while len(buffer) >= chunk_size:
-                    pcm_chunk = bytes(buffer[:chunk_size])
-                    buffer = buffer[chunk_size:]
-                    yield wrap_pcm_as_wav(pcm_chunk)
-
-            except asyncio.TimeoutError:
-                logger.warning("Audio read timeout, stream may have ended")
-                break
-            except Exception as e:
-                logger.error(f"Error reading audio stream: {e}")
-                break
-
-        # Yield remaining buffer
-        if buffer:
-            yield wrap_pcm_as_wav(bytes(buffer))
-
-        await self.stop()
+                yield chunk
+        finally:
+            await self.stop()
+            await decoder
 
     async def stop(self):
         """Stop audio capture."""
         self._running = False
-        if self._process and self._process.returncode is None:
+        if self._process and self._process.poll() is None:
             self._process.terminate()
             try:
-                await asyncio.wait_for(self._process.wait(), timeout=5)
-            except asyncio.TimeoutError:
+                await asyncio.to_thread(self._process.wait, 5)
+            except subprocess.TimeoutExpired:
                 self._process.kill()
         logger.info("Audio capture stopped")
 
@@ -125,49 +184,45 @@ class YouTubeAudioCapture:
 class AudioFileCapture:
     """Captures audio from a local file - useful for testing."""
 
-    def __init__(self, file_path: str, chunk_duration: int = 5):
+    def __init__(self, file_path: str, chunk_duration: int = 5, sample_rate: int = 16000):
         self.file_path = file_path
         self.chunk_duration = chunk_duration
+        self.sample_rate = sample_rate
 
     async def get_audio_chunks(self):
         """Yield audio chunks from a local file using ffmpeg.
 
-        Each chunk is wrapped with a WAV header so Deepgram can decode it.
+        Each chunk is yielded as an AudioChunk of raw PCM.
         """
-        # Output raw PCM (s16le) so we can wrap each chunk with a WAV header
+        # Output raw PCM (s16le); Deepgram is told the format, so no WAV header
         command = [
             "ffmpeg",
             "-i", self.file_path,
             "-f", "s16le",
             "-acodec", "pcm_s16le",
-            "-ar", "16000",
+            "-ar", str(self.sample_rate),
             "-ac", "1",
             "-",
         ]
 
+        # sample_rate samples/sec * 2 bytes/sample * chunk_duration
+        sample_rate = self.sample_rate
+        chunk_size = sample_rate * 2 * self.chunk_duration
+
         process = await asyncio.create_subprocess_exec(
             *command,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
+            limit=chunk_size * 2,
         )
 
-        # 16000 samples/sec * 2 bytes/sample * chunk_duration
-        chunk_size = 16000 * 2 * self.chunk_duration
-        buffer = bytearray()
-
         while True:
-            data = await process.stdout.read(4096)
-            if not data:
+            try:
+                pcm_chunk = await process.stdout.readexactly(chunk_size)
+            except asyncio.IncompleteReadError as e:
+                if e.partial:
+                    yield _to_audio_chunk(e.partial, sample_rate)
                 break
-
-            buffer.extend(data)
-
-            while len(buffer) >= chunk_size:
-                pcm_chunk = bytes(buffer[:chunk_size])
-                buffer = buffer[chunk_size:]
-                yield wrap_pcm_as_wav(pcm_chunk)
-
-        if buffer:
-            yield wrap_pcm_as_wav(bytes(buffer))
+            yield _to_audio_chunk(pcm_chunk, sample_rate)
 
         await process.wait()
@@ -6,28 +6,41 @@ Classifies commentary by event type, generates Telugu translation via Sarvam-m,
 and logs English-Telugu pairs to a JSONL file for future model fine-tuning.
 
 LLM roles:
-  - Event classification  → Groq llama-3.1-8b-instant (fast English task)
-  - Telugu commentary     → Sarvam-m (purpose-built for Indian languages)
+  - Classification + Telugu commentary → Sarvam-m, in one call: the reply
+    opens with an event tag ([HYPE] …) followed by the commentary
+  - Fallback classification            → Groq llama-3.1-8b-instant, only
+    when a reply comes back untagged
 """
 
-import json
 import logging
+import queue
+import re
+import threading
+import time
+from contextlib import aclosing
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 import httpx
-from groq import Groq
+import orjson
+from groq import AsyncGroq
 
-from config import settings
+from config import get_settings
+from utils.text import SENTENCE_BREAK
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 DATASET_DIR = Path(__file__).resolve().parent.parent / "datasets"
 DATASET_DIR.mkdir(exist_ok=True)
+DATASET_BUFFER_SIZE = 1 << 16  # bytes of JSONL buffered before hitting disk
+DATASET_FLUSH_INTERVAL = 1.0  # seconds; most a crash can lose from the file
+DATASET_WRITE_BATCH = 64  # entries serialized and written per write() call
 
 SARVAM_CHAT_URL = "https://api.sarvam.ai/v1/chat/completions"
 
-# ── Classification prompt (runs on a small fast model) ──────────────────────
+# ── Fallback classification prompt (runs on a small fast model) ─────────────
 
 CLASSIFY_PROMPT = """You are an F1 commentary classifier. Given an English commentary line, classify it into ONE of these types:
 
@@ -38,7 +51,7 @@ CLASSIFY_PROMPT = """You are an F1 commentary classifier. Given an English comme
 
 Respond with ONLY the event type word. Nothing else."""
 
-# ── Telugu generation prompt (energy-aware) ─────────────────────────────────
+# ── Telugu generation prompt (classifies, then energy-aware commentary) ─────
 
 COMMENTARY_PROMPT = """You are a passionate Telugu Formula 1 commentator broadcasting LIVE on TV.
 
@@ -46,24 +59,57 @@ CRITICAL RULES:
 1. NEVER do word-by-word translation. Rewrite as a natural Telugu commentator would say it.
 2. Keep F1 terms in English: DRS, pit stop, undercut, overcut, soft/medium/hard tires, safety car, VSC, red flag, etc.
 3. Keep driver names and team names in English.
-4. Match your energy to the event type provided.
+4. First decide the event type of the English line, then match your energy to it.
+
+EVENT TYPES:
+- [HYPE]: Overtakes, crashes, dramatic moments, celebrations, collisions, race wins
+- [TENSION]: Close battles, gap closing, DRS zones, last few laps, wheel-to-wheel
+- [INFO]: Pit stops, tire changes, strategy calls, penalties, grid positions, weather updates
+- [FILLER]: Parade laps, cars circulating normally, generic observations, repetitive updates
 
 ENERGY GUIDE:
 - [HYPE]: Go WILD! Use "అబ్బా!", "ఏమి move రా!", "అద్భుతం!", "భలే!", elongate words for emphasis. Be dramatic.
 - [TENSION]: Build suspense. "చూడండి...", "gap తగ్గుతోంది...", "ఏం జరుగుతుందో...", short punchy sentences.
 - [INFO]: Be clear and brief. State the fact naturally in Telugu. No need for excitement.
-- [FILLER]: Output EXACTLY "##SKIP##" — do not translate filler lines.
+- [FILLER]: Output nothing after the tag — do not translate filler lines.
+
+OUTPUT FORMAT:
+Start with the event type tag — exactly one of [HYPE], [TENSION], [INFO], [FILLER] — then the Telugu commentary.
+No explanations, no English sentences, no other brackets."""
+
+# Leading event tag of a commentary reply, e.g. "[HYPE] అబ్బా! ..."
+# The closing bracket is optional so a truncated "[FILLER" still counts
+_EVENT_TAG = re.compile(r"^\s*\[(hype|tension|info|filler)\]?\s*", re.IGNORECASE)
+
 
-Output ONLY the Telugu commentary. No explanations, no English, no brackets."""
+# Static request parts, built once rather than per call
+_CLASSIFY_SYSTEM_MESSAGE = {"role": "system", "content": CLASSIFY_PROMPT}
+_SARVAM_HEADERS = {
+    "api-subscription-key": settings.SARVAM_API_KEY,
+    "Content-Type": "application/json",
+}
+
+
+@lru_cache(maxsize=16)
+def _commentary_system_message(context: str) -> dict:
+    """System message for a race context: the fixed prompt, then the context.
+
+    Context only changes every ~10s, so the ~1.5 KB prompt string is
+    rebuilt once per context rather than once per line.
+    """
+    system_prompt = COMMENTARY_PROMPT
+    if context:
+        system_prompt += f"\n\nRace context: {context}"
+    return {"role": "system", "content": system_prompt}
 
 
-def _classify_event(client: Groq, english_text: str) -> str:
+async def _classify_event(client: AsyncGroq, english_text: str) -> str:
     """Classify a commentary line into an event type using a small fast model."""
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=settings.CLASSIFY_MODEL,
             messages=[
-                {"role": "system", "content": CLASSIFY_PROMPT},
+                _CLASSIFY_SYSTEM_MESSAGE,
                 {"role": "user", "content": english_text},
             ],
             max_tokens=10,
@@ -78,60 +124,149 @@ def _classify_event(client: Groq, english_text: str) -> str:
         return "info"
 
 
-async def _generate_telugu_sarvam(english_text: str, event_type: str, context: str = "") -> str:
-    """Generate natural Telugu commentary via Sarvam-m.
+async def _stream_telugu_sarvam(client: httpx.AsyncClient, english_text: str, context: str = ""):
+    """Stream natural Telugu commentary from Sarvam-m, one sentence at a time.
 
     Sarvam-m is purpose-built for Indian languages — produces more natural,
     culturally appropriate Telugu output vs generic multilingual models.
+    Tokens arrive over SSE; each sentence is yielded as soon as its terminator
+    (. ? ! ।) is followed by more output, so TTS can start before the reply ends.
+    A leading event tag is yielded on its own as soon as it is complete, so the
+    caller can stop reading a filler reply without waiting for the rest.
+    A failed request is logged and re-raised, even after sentences have been
+    yielded, so a truncated reply is never mistaken for a complete one.
     """
-    user_message = f"[{event_type.upper()}] {english_text}"
-    if context:
-        user_message += f"\nRace context: {context}"
-
+    # Stable prefix first (prompt, then race context which changes every ~10s);
+    # the per-line English goes last so provider prefix caching can reuse the rest
     payload = {
         "model": settings.LLM_MODEL,
         "messages": [
-            {"role": "system", "content": COMMENTARY_PROMPT},
-            {"role": "user", "content": user_message},
+            _commentary_system_message(context),
+            {"role": "user", "content": english_text},
         ],
         "max_tokens": settings.LLM_MAX_TOKENS,
         "temperature": settings.LLM_TEMPERATURE,
+        "stream": True,
     }
 
-    headers = {
-        "api-subscription-key": settings.SARVAM_API_KEY,
-        "Content-Type": "application/json",
-    }
-
+    pending = ""
+    tag_checked = False
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(SARVAM_CHAT_URL, json=payload, headers=headers)
+        async with client.stream(
+            "POST", SARVAM_CHAT_URL, json=payload, headers=_SARVAM_HEADERS
+        ) as response:
+            if response.is_error:
+                await response.aread()
             response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"].strip()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                delta = orjson.loads(data)["choices"][0]["delta"].get("content")
+                if not delta:
+                    continue
+                if not tag_checked:
+                    pending += delta
+                    delta = ""
+                    head = pending.lstrip()
+                    if head and not head.startswith("["):
+                        tag_checked = True  # untagged reply
+                    elif "]" in head:
+                        tag_checked = True
+                        match = _EVENT_TAG.match(pending)
+                        if match:
+                            yield match.group(0).strip()
+                            pending = pending[match.end():]
+                # Hold back the unfinished tail; emit every completed sentence
+                *sentences, pending = SENTENCE_BREAK.split(pending + delta)
+                for sentence in sentences:
+                    if sentence.strip():
+                        yield sentence.strip()
     except httpx.HTTPStatusError as e:
         logger.error(
             f"Sarvam-m HTTP error {e.response.status_code}: {e.response.text}"
         )
-        return ""
+        raise
     except Exception as e:
         logger.error(f"Sarvam-m Telugu generation failed: {e}")
-        return ""
+        raise
+
+    if pending.strip():
+        yield pending.strip()
+
+
+def _write_dataset_file(path: Path, entries: queue.Queue):
+    """Writer thread: append queued entries to the JSONL file until None arrives.
+
+    Entries are written in batches; the file is flushed once
+    DATASET_FLUSH_INTERVAL has passed since the last flush, or when no entry
+    arrived for that long.
+    """
+    with open(path, "ab", buffering=DATASET_BUFFER_SIZE) as fh:
+        last_flush = time.monotonic()
+        done = False
+        while not done:
+            try:
+                batch = [entries.get(timeout=DATASET_FLUSH_INTERVAL)]
+            except queue.Empty:
+                batch = []
+            while batch and len(batch) < DATASET_WRITE_BATCH:
+                try:
+                    batch.append(entries.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                done = True
+                batch = batch[:batch.index(None)]
+            if batch:
+                # orjson emits UTF-8 directly, so Telugu text is written unescaped
+                fh.write(b"".join(
+                    orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+                    for entry in batch
+                ))
+            now = time.monotonic()
+            if not batch or now - last_flush >= DATASET_FLUSH_INTERVAL:
+                fh.flush()
+                last_flush = now
 
 
 class DatasetCollector:
-    """Drop-in replacement for TeluguCommentaryAgent that also logs
-    every English→Telugu pair to a JSONL dataset file.
+    """Generates Telugu commentary for the pipeline and logs every
+    English→Telugu pair to a JSONL dataset file.
 
-    - Classification: Groq llama-3.1-8b-instant (fast, accurate in English)
-    - Generation:     Sarvam-m (best-in-class for Telugu output quality)
+    - Classification + generation: Sarvam-m (best-in-class for Telugu output quality)
+    - Fallback classification:     Groq llama-3.1-8b-instant (fast, accurate in English)
     """
 
-    def __init__(self, race_name: str | None = None):
-        self.groq_client = Groq(api_key=settings.GROQ_API_KEY)
+    def __init__(
+        self,
+        race_name: str | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        groq_client: AsyncGroq | None = None,
+    ):
+        # Pooled keep-alive client for Sarvam-m and Groq; pass one in to share it
+        self.http_client = http_client or httpx.AsyncClient(timeout=30)
+        # Async client so a fallback classification never blocks the event loop
+        self.groq_client = groq_client or AsyncGroq(
+            api_key=settings.GROQ_API_KEY, http_client=self.http_client
+        )
         self.race_name = race_name or datetime.now().strftime("%Y-%m-%d")
         self.dataset_file = DATASET_DIR / f"race_{self.race_name}.jsonl"
         self.stats = {"hype": 0, "tension": 0, "info": 0, "filler": 0, "total": 0}
         self.current_context = ""
+        self._context_source = None  # leaderboard current_context was built from
+
+        # Entries are queued for a writer thread that owns the dataset file,
+        # so no disk I/O happens on the event loop. The thread starts on the
+        # first write and is stopped by finish(); the lock covers finish()
+        # running in a worker thread. Lines that land after finish() are
+        # dropped rather than starting a writer nothing will stop.
+        self._dataset_queue: queue.Queue | None = None
+        self._dataset_writer: threading.Thread | None = None
+        self._dataset_lock = threading.Lock()
+        self._finished = False
 
         logger.info(f"DatasetCollector saving to: {self.dataset_file}")
 
@@ -141,6 +276,10 @@ class DatasetCollector:
 
     def update_race_context(self, leaderboard_data: dict):
         """Update context from leaderboard data."""
+        # The engine hands out the same dict until the leaderboard changes
+        if leaderboard_data is self._context_source:
+            return
+        self._context_source = leaderboard_data
         positions = leaderboard_data.get("positions", [])
         leader = positions[0]["driver_name"] if positions else "Unknown"
         top_3 = ", ".join(p["driver_name"] for p in positions[:3])
@@ -153,22 +292,88 @@ class DatasetCollector:
 
         Returns Telugu text, or empty string if the line was filler.
         """
+        _, telugu_text = await self.commentate(english_text, context)
+        return telugu_text
+
+    async def commentate(
+        self, english_text: str, context: str | None = None, on_sentence=None
+    ) -> tuple[str, str]:
+        """Like generate_telugu_commentary, but returns ``(event_type, telugu)``
+        and calls ``on_sentence`` with each Telugu sentence as soon as Sarvam-m
+        finishes it. Telugu is empty (and nothing is passed on) for filler.
+
+        If Sarvam-m fails, event_type is "" and the Telugu is only what was
+        already passed on; the line is not recorded.
+        """
         ctx = context or self.current_context
 
-        # 1. Classify event type (Groq — fast English classification)
-        event_type = _classify_event(self.groq_client, english_text)
+        # 1. Classify + generate in one Sarvam-m call; the reply's leading
+        #    tag is the event type, everything after it the Telugu commentary
+        event_type = None
+        sentences = []
+        reply = _stream_telugu_sarvam(self.http_client, english_text, ctx)
+        try:
+            async with aclosing(reply):
+                async for sentence in reply:
+                    if event_type is None:
+                        match = _EVENT_TAG.match(sentence)
+                        event_type = match.group(1).lower() if match else ""
+                        sentence = sentence[match.end():] if match else sentence
+                    # 2. Skip filler: stop reading as soon as the tag says so,
+                    #    rather than paying for the rest of the generation
+                    if event_type == "filler":
+                        break
+                    if not sentence:
+                        continue
+                    sentences.append(sentence)
+                    # An untagged reply might still be filler; hold it back
+                    # until the classifier has decided
+                    if on_sentence and event_type:
+                        on_sentence(sentence)
+        except Exception:
+            # Already logged. Keep the truncated reply out of the stats and
+            # dataset, and hand back only the sentences already passed on
+            return "", " ".join(sentences) if event_type else ""
+
+        telugu_text = "" if event_type == "filler" else " ".join(sentences)
+        if not event_type:
+            # Untagged reply: label it with the fast classifier
+            event_type = await _classify_event(self.groq_client, english_text)
+            if event_type == "filler":
+                telugu_text = ""
+            elif on_sentence:
+                for sentence in sentences:
+                    on_sentence(sentence)
+
+        self.record(english_text, ctx, event_type, telugu_text)
+        return event_type, telugu_text
+
+    def record(self, english_text: str, context: str, event_type: str, telugu_text: str):
+        """Count and log one commentary line.
+
+        Called for every line, including repeats the pipeline serves from its
+        cache, so stats and the dataset reflect the whole broadcast.
+        No-op once finish() has run.
+        """
+        if self._finished:
+            return
         self.stats[event_type] += 1
         self.stats["total"] += 1
 
-        # 2. Generate Telugu commentary (Sarvam-m — best for Telugu)
-        telugu_text = await _generate_telugu_sarvam(english_text, event_type, ctx)
+        # 3. Log to dataset
+        if settings.DATASET_COLLECTION:
+            self._write_entry(
+                english_text, context, event_type, telugu_text, event_type == "filler"
+            )
 
-        # 3. Skip filler
-        is_skipped = telugu_text == "##SKIP##" or event_type == "filler"
-        if is_skipped:
-            telugu_text = ""
+        # 4. Periodic stats
+        if self.stats["total"] % 50 == 0:
+            self._log_stats()
 
-        # 4. Log to dataset
+    def _write_entry(
+        self, english_text: str, ctx: str, event_type: str, telugu_text: str, is_skipped: bool
+    ):
+        """Append one English→Telugu pair to the JSONL dataset file."""
         entry = {
             "input": {
                 "event_type": event_type,
@@ -177,20 +382,36 @@ class DatasetCollector:
             },
             "output": telugu_text,
             "metadata": {
-                "timestamp": datetime.now().isoformat(),
+                # orjson formats datetimes natively, identical to isoformat()
+                "timestamp": datetime.now(),
                 "race": self.race_name,
                 "skipped": is_skipped,
                 "model": settings.LLM_MODEL,
             },
         }
-        with open(self.dataset_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-
-        # 5. Periodic stats
-        if self.stats["total"] % 50 == 0:
-            self._log_stats()
-
-        return telugu_text
+        with self._dataset_lock:
+            if self._finished:
+                return
+            if self._dataset_writer is None:
+                self._dataset_queue = queue.Queue()
+                self._dataset_writer = threading.Thread(
+                    target=_write_dataset_file,
+                    args=(self.dataset_file, self._dataset_queue),
+                    name="dataset-writer",
+                    daemon=True,
+                )
+                self._dataset_writer.start()
+            self._dataset_queue.put(entry)
+
+    def _close_dataset_file(self):
+        """Stop the writer thread once it has written everything queued."""
+        with self._dataset_lock:
+            self._finished = True
+            if self._dataset_writer is not None:
+                self._dataset_queue.put(None)
+                self._dataset_writer.join()
+                self._dataset_writer = None
+                self._dataset_queue = None
 
     def _log_stats(self):
         logger.info(
@@ -201,7 +422,8 @@ class DatasetCollector:
         )
 
     def finish(self):
-        """Call at end of race/stream to log final stats."""
+        """Call at end of race/stream to flush the dataset file and log final stats."""
+        self._close_dataset_file()
         logger.info("=" * 60)
         logger.info(f"RACE COMPLETE: {self.race_name}")
         self._log_stats()
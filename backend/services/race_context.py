@@ -13,14 +13,30 @@ OpenF1 API docs: https://openf1.org
 
 import asyncio
 import logging
-from typing import Optional
+from typing import NamedTuple, Optional
+from urllib.parse import quote
 
 import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
 OPENF1_BASE = "https://api.openf1.org/v1"
 REFRESH_INTERVAL = 10  # seconds — matches design doc spec
+LAP_REFETCH_WINDOW = 3  # laps behind the newest lap still re-fetched each refresh
+EMPTY_POLLS_BEFORE_RESYNC = 6  # empty incremental refreshes before a full fetch
+
+
+class Position(NamedTuple):
+    """One leaderboard row; fields are the keys of its JSON form."""
+    position: int
+    driver_number: int
+    driver_name: str
+    driver_code: str
+    team: str
+    team_colour: str
+    gap: str
+    last_lap_time: str
 
 
 class RaceContextEngine:
@@ -33,52 +49,81 @@ class RaceContextEngine:
     def __init__(self):
         self._session_key: Optional[int] = None
         self._session_info: dict = {}
-        self._drivers: dict = {}        # driver_number → driver info
+        self._drivers: dict = {}        # driver_number → pre-formatted leaderboard fields
         self._latest_positions: dict = {}  # driver_number → latest position record
         self._latest_laps: dict = {}    # driver_number → latest lap record
-        self._leaderboard: dict = {}
+        self._pos_cursor = ""           # newest position "date" seen; "" → full fetch
+        self._use_filters = True        # cleared if OpenF1 rejects the incremental filters
+        self._empty_polls = 0           # consecutive incremental refreshes with no data
+        self._leaderboard: dict = {}    # positions held as Position rows
+        self._leaderboard_json: Optional[dict] = None  # dict form, built on demand
+        self._leaderboard_sig = None    # inputs the current leaderboard was built from
+        self._context_string = ""       # prompt context for the current leaderboard
+        self._leaderboard_changed = asyncio.Event()
         self._running = False
         self._task: Optional[asyncio.Task] = None
+        self._http: Optional[httpx.AsyncClient] = None
 
     async def start(self):
         """Start the background refresh loop."""
         self._running = True
+        # One keep-alive client for the engine's lifetime, so refreshes skip
+        # the TCP + TLS handshake to OpenF1
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=OPENF1_BASE,
+                timeout=10,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=4),
+            )
         await self._fetch_latest_session()
         if self._session_key:
-            await self._fetch_drivers()
-            await self._fetch_data()
+            await asyncio.gather(self._fetch_drivers(), self._fetch_data())
+            # Data may have landed before the roster; rebuild with driver names
+            self._build_leaderboard()
         self._task = asyncio.create_task(self._refresh_loop())
         logger.info(f"RaceContextEngine started (session_key={self._session_key})")
 
     async def stop(self):
         """Stop the refresh loop."""
         self._running = False
+        # Wake anyone waiting for a change so they can see we've stopped
+        self._leaderboard_changed.set()
         if self._task:
             self._task.cancel()
             try:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     async def _fetch_latest_session(self):
         """Find the most recent live session (Race, Qualifying, or Practice)."""
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.get(
-                    f"{OPENF1_BASE}/sessions",
-                    params={"session_key": "latest"},
-                )
-                if resp.status_code == 200:
-                    sessions = resp.json()
-                    if sessions:
-                        session = sessions[-1]
-                        self._session_key = session.get("session_key")
-                        self._session_info = session
-                        logger.info(
-                            f"Session: {session.get('session_name')} | "
-                            f"Circuit: {session.get('circuit_short_name')} | "
-                            f"Key: {self._session_key}"
-                        )
+            resp = await self._http.get(
+                "/sessions",
+                params={"session_key": "latest"},
+            )
+            if resp.status_code == 200:
+                sessions = orjson.loads(resp.content)
+                if sessions:
+                    session = sessions[-1]
+                    if session.get("session_key") != self._session_key:
+                        # New session: incremental cursors no longer apply
+                        self._latest_positions.clear()
+                        self._latest_laps.clear()
+                        self._pos_cursor = ""
+                        self._use_filters = True
+                        self._empty_polls = 0
+                    self._session_key = session.get("session_key")
+                    self._session_info = session
+                    logger.info(
+                        f"Session: {session.get('session_name')} | "
+                        f"Circuit: {session.get('circuit_short_name')} | "
+                        f"Key: {self._session_key}"
+                    )
         except Exception as e:
             logger.warning(f"Failed to fetch latest session: {e}")
 
@@ -87,64 +132,140 @@ class RaceContextEngine:
         if not self._session_key:
             return
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.get(
-                    f"{OPENF1_BASE}/drivers",
-                    params={"session_key": self._session_key},
-                )
-                if resp.status_code == 200:
-                    for driver in resp.json():
-                        num = driver.get("driver_number")
-                        if num is not None:
-                            self._drivers[num] = driver
-                    logger.info(f"Loaded {len(self._drivers)} drivers")
+            resp = await self._http.get(
+                "/drivers",
+                params={"session_key": self._session_key},
+            )
+            if resp.status_code == 200:
+                for driver in orjson.loads(resp.content):
+                    num = driver.get("driver_number")
+                    if num is not None:
+                        # Format the static half of each leaderboard row once
+                        self._drivers[num] = {
+                            "driver_number": num,
+                            "driver_name": driver.get("full_name") or f"Car {num}",
+                            "driver_code": driver.get("name_acronym") or "???",
+                            "team": driver.get("team_name") or "Unknown",
+                            "team_colour": f"#{driver.get('team_colour') or 'ffffff'}",
+                        }
+                logger.info(f"Loaded {len(self._drivers)} drivers")
         except Exception as e:
             logger.warning(f"Failed to fetch drivers: {e}")
 
     async def _refresh_loop(self):
         """Refresh position and lap data every 10 seconds."""
+        # Sleep to a fixed schedule, so the fetch time doesn't add to the
+        # interval; after an overrun, skip ahead rather than refresh back-to-back
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + REFRESH_INTERVAL
         while self._running:
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
             try:
                 await self._fetch_data()
             except Exception as e:
                 logger.warning(f"Race context refresh error: {e}")
-            await asyncio.sleep(REFRESH_INTERVAL)
+            now = loop.time()
+            deadline += REFRESH_INTERVAL
+            if deadline <= now:
+                deadline = now + REFRESH_INTERVAL - (now - deadline) % REFRESH_INTERVAL
 
     async def _fetch_data(self):
         """Fetch latest position and lap data from OpenF1."""
         if not self._session_key:
             return
 
-        async with httpx.AsyncClient(timeout=10) as client:
-            # Position data
-            pos_resp = await client.get(
-                f"{OPENF1_BASE}/position",
-                params={"session_key": self._session_key},
-            )
-
-            # Latest lap data (for lap count)
-            lap_resp = await client.get(
-                f"{OPENF1_BASE}/laps",
-                params={"session_key": self._session_key},
-            )
-
-        if pos_resp.status_code == 200:
-            self._update_positions(pos_resp.json())
-
-        if lap_resp.status_code == 200:
-            self._update_laps(lap_resp.json())
+        # Only ask for records newer than what we already hold, unless a run
+        # of empty replies suggests we've lost sync. OpenF1 filters (date>…,
+        # lap_number>=…) aren't key=value pairs, so they're appended by hand;
+        # httpx still percent-encodes the operators (date%3E…), which relies
+        # on OpenF1 URL-decoding the query before parsing them. If it rejects
+        # a filter as malformed, filters are dropped for the rest of the session.
+        incremental = self._use_filters and self._empty_polls < EMPTY_POLLS_BEFORE_RESYNC
+        pos_url = f"/position?session_key={self._session_key}"
+        pos_filtered = bool(incremental and self._pos_cursor)
+        if pos_filtered:
+            pos_url += f"&date>{quote(self._pos_cursor)}"
+        lap_url = f"/laps?session_key={self._session_key}"
+        lap_floor = self._lap_floor() if incremental else None
+        lap_filtered = bool(lap_floor)
+        if lap_filtered:
+            lap_url += f"&lap_number>={lap_floor}"
+
+        # Position data and latest lap data (for lap count), fetched concurrently
+        pos_resp, lap_resp = await asyncio.gather(
+            self._http.get(pos_url),
+            self._http.get(lap_url),
+            return_exceptions=True,
+        )
+        positions = self._read_records(pos_resp, "positions", pos_filtered)
+        laps = self._read_records(lap_resp, "laps", lap_filtered)
+
+        if positions:
+            self._update_positions(positions)
+        if laps:
+            self._update_laps(laps)
+
+        # The lap query always re-reads current laps, so both coming back
+        # empty means the filters no longer match anything. A failed fetch
+        # says nothing either way and leaves the count as it is.
+        if positions is None or laps is None:
+            pass
+        elif incremental and positions == [] and laps == []:
+            self._empty_polls += 1
+            if self._empty_polls == EMPTY_POLLS_BEFORE_RESYNC:
+                logger.warning(
+                    f"No new OpenF1 data for {self._empty_polls} refreshes; "
+                    "falling back to a full fetch"
+                )
+        else:
+            self._empty_polls = 0
 
         self._build_leaderboard()
 
+    def _lap_floor(self) -> Optional[int]:
+        """Lowest lap to re-fetch: the slowest car within LAP_REFETCH_WINDOW laps
+        of the newest lap, so in-progress laps pick up their duration once
+        completed. Cars further back (retired, mostly) no longer hold it down.
+        """
+        if not self._latest_laps:
+            return None
+        laps = [r.get("lap_number") or 0 for r in self._latest_laps.values()]
+        newest = max(laps)
+        return min(lap for lap in laps if lap >= newest - LAP_REFETCH_WINDOW)
+
+    def _read_records(self, resp, what: str, filtered: bool) -> Optional[list]:
+        """Records from an OpenF1 reply; [] for no results, None on failure.
+
+        ``filtered`` says whether a date>/lap_number>= filter was added to the
+        request, so a 400/422 can be put down to the filter. Other failures
+        (429 rate limits, 5xx) just skip this refresh.
+        """
+        if isinstance(resp, Exception):
+            logger.warning(f"Failed to fetch {what}: {resp}")
+            return None
+        if resp.status_code == 200:
+            return orjson.loads(resp.content)
+        if resp.status_code == 404:
+            # OpenF1 answers a query that matches nothing with a 404
+            return []
+        logger.warning(f"Failed to fetch {what}: HTTP {resp.status_code}")
+        if filtered and resp.status_code in (400, 422):
+            self._use_filters = False
+            logger.warning("OpenF1 rejected incremental filters; fetching in full")
+        return None
+
     def _update_positions(self, position_data: list):
         """Keep only the latest position record per driver."""
         for record in position_data:
             num = record.get("driver_number")
             if num is None:
                 continue
+            date = record.get("date", "")
             existing = self._latest_positions.get(num)
-            if existing is None or record.get("date", "") > existing.get("date", ""):
+            if existing is None or date > existing.get("date", ""):
                 self._latest_positions[num] = record
+            if date > self._pos_cursor:
+                self._pos_cursor = date
 
     def _update_laps(self, lap_data: list):
         """Keep only the latest lap record per driver."""
@@ -159,6 +280,22 @@ class RaceContextEngine:
 
     def _build_leaderboard(self):
         """Assemble a sorted leaderboard from position + lap + driver data."""
+        # Most refreshes bring no change to anything shown; skip the rebuild
+        # (and the comparison with the previous leaderboard) when the inputs
+        # the leaderboard is built from are the same as last time
+        sig = (
+            self._session_key,
+            len(self._drivers),
+            frozenset((n, r.get("position")) for n, r in self._latest_positions.items()),
+            frozenset(
+                (n, r.get("lap_number"), r.get("lap_duration"))
+                for n, r in self._latest_laps.items()
+            ),
+        )
+        if sig == self._leaderboard_sig:
+            return
+        self._leaderboard_sig = sig
+
         sorted_positions = sorted(
             self._latest_positions.values(),
             key=lambda x: x.get("position", 99),
@@ -167,7 +304,7 @@ class RaceContextEngine:
         positions = []
         for record in sorted_positions:
             num = record.get("driver_number")
-            driver = self._drivers.get(num, {})
+            driver = self._drivers.get(num) or _unknown_driver(num)
             lap_record = self._latest_laps.get(num, {})
 
             lap_duration = lap_record.get("lap_duration")
@@ -175,16 +312,12 @@ class RaceContextEngine:
                 _format_lap_time(lap_duration) if lap_duration else "—"
             )
 
-            positions.append({
-                "position": record.get("position"),
-                "driver_number": num,
-                "driver_name": driver.get("full_name", f"Car {num}"),
-                "driver_code": driver.get("name_acronym", "???"),
-                "team": driver.get("team_name", "Unknown"),
-                "team_colour": f"#{driver.get('team_colour', 'ffffff')}",
-                "gap": "—",           # OpenF1 doesn't expose gap directly
-                "last_lap_time": last_lap_str,
-            })
+            positions.append(Position(
+                position=record.get("position"),
+                gap="—",              # OpenF1 doesn't expose gap directly
+                last_lap_time=last_lap_str,
+                **driver,
+            ))
 
         # Determine current lap from the leader's lap data
         leader_num = sorted_positions[0].get("driver_number") if sorted_positions else None
@@ -195,7 +328,7 @@ class RaceContextEngine:
         session_name = self._session_info.get("session_name", "")
         total_laps = self._session_info.get("total_laps") or 0
 
-        self._leaderboard = {
+        leaderboard = {
             "session_key": self._session_key,
             "session_name": session_name,
             "circuit": self._session_info.get("circuit_short_name", ""),
@@ -204,36 +337,75 @@ class RaceContextEngine:
             "current_lap": current_lap,
             "total_laps": total_laps,
         }
+        if leaderboard != self._leaderboard:
+            self._leaderboard = leaderboard
+            self._leaderboard_json = None
+            self._context_string = _format_context(leaderboard)
+            self._leaderboard_changed.set()
 
     def get_leaderboard(self) -> dict:
-        """Return the current structured leaderboard for WebSocket broadcast."""
-        return self._leaderboard
+        """Return the current structured leaderboard for WebSocket broadcast.
+
+        Rows are converted to dicts once per leaderboard change, and only when
+        someone asks; the same dict is returned until the next change.
+        """
+        if self._leaderboard_json is None:
+            leaderboard = self._leaderboard
+            if leaderboard:
+                leaderboard = {
+                    **leaderboard,
+                    "positions": [row._asdict() for row in leaderboard["positions"]],
+                }
+            self._leaderboard_json = leaderboard
+        return self._leaderboard_json
+
+    async def wait_for_leaderboard_change(self):
+        """Wait until the leaderboard has changed since the last wait (or stop())."""
+        await self._leaderboard_changed.wait()
+        self._leaderboard_changed.clear()
 
     def get_context_string(self) -> str:
         """Return a compact context string for LLM prompt injection."""
-        positions = self._leaderboard.get("positions", [])
-        if not positions:
-            return ""
-
-        leader = positions[0].get("driver_name", "Unknown")
-        top_3 = " | ".join(
-            f"P{p['position']} {p['driver_name']}"
-            for p in positions[:3]
-        )
-        lap = self._leaderboard.get("current_lap", "?")
-        total = self._leaderboard.get("total_laps", "?")
-        circuit = self._leaderboard.get("circuit", "")
-        session = self._leaderboard.get("session_name", "")
-
-        parts = [f"Leader: {leader}", f"Top 3: [{top_3}]"]
-        if lap and total:
-            parts.append(f"Lap: {lap}/{total}")
-        if circuit:
-            parts.append(f"Circuit: {circuit}")
-        if session:
-            parts.append(f"Session: {session}")
-
-        return " | ".join(parts)
+        # Built once per leaderboard change rather than once per commentary line
+        return self._context_string
+
+
+def _format_context(leaderboard: dict) -> str:
+    """Format a leaderboard (with Position rows) as the compact LLM context string."""
+    positions = leaderboard.get("positions", [])
+    if not positions:
+        return ""
+
+    leader = positions[0].driver_name
+    top_3 = " | ".join(
+        f"P{p.position} {p.driver_name}"
+        for p in positions[:3]
+    )
+    lap = leaderboard.get("current_lap", "?")
+    total = leaderboard.get("total_laps", "?")
+    circuit = leaderboard.get("circuit", "")
+    session = leaderboard.get("session_name", "")
+
+    parts = [f"Leader: {leader}", f"Top 3: [{top_3}]"]
+    if lap and total:
+        parts.append(f"Lap: {lap}/{total}")
+    if circuit:
+        parts.append(f"Circuit: {circuit}")
+    if session:
+        parts.append(f"Session: {session}")
+
+    return " | ".join(parts)
+
+
+def _unknown_driver(num) -> dict:
+    """Roster entry for a car that isn't (yet) in the driver list."""
+    return {
+        "driver_number": num,
+        "driver_name": f"Car {num}",
+        "driver_code": "???",
+        "team": "Unknown",
+        "team_colour": "#ffffff",
+    }
 
 
 def _format_lap_time(seconds: float) -> str:
@@ -1,19 +1,28 @@
 import asyncio
+import io
 import logging
 
-from deepgram import DeepgramClient
+from deepgram import AsyncDeepgramClient, DeepgramClient
+from deepgram.extensions.types.sockets import ListenV1ControlMessage
 
-from config import settings
+from config import get_settings
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_SENT_ENDS = frozenset(".!?")
+MAX_BUFFERED_TRANSCRIPTS = 5  # emit even without a sentence end after this many
 
 
 class SpeechToTextService:
     """Real-time speech-to-text using Deepgram's WebSocket streaming API (SDK v5)."""
 
     def __init__(self):
-        self.client = DeepgramClient(api_key=settings.DEEPGRAM_API_KEY)
-        self.transcript_buffer: list[str] = []
+        # Async client: socket reads and writes are awaited on the event loop
+        self.client = AsyncDeepgramClient(api_key=settings.DEEPGRAM_API_KEY)
+        # Transcripts awaiting a sentence end, space-separated
+        self.transcript_buffer = io.StringIO()
+        self._buffered = 0
 
     async def transcribe_stream(self, audio_chunks, on_sentence):
         """Process audio chunks through Deepgram's live transcription.
@@ -23,7 +32,7 @@ class SpeechToTextService:
             on_sentence: async callback called with each complete sentence
         """
         try:
-            with self.client.listen.v1.connect(
+            async with self.client.listen.v1.connect(
                 model="nova-2",
                 language="en",
                 punctuate="true",
@@ -34,14 +43,18 @@ class SpeechToTextService:
             ) as ws:
                 logger.info("Deepgram live transcription started")
 
-                async for chunk in audio_chunks:
-                    ws.send(chunk)
-
-                    # Check for results
-                    for message in ws:
-                        transcript = self._extract_transcript(message)
-                        if transcript:
-                            await self._handle_transcript(transcript, on_sentence)
+                # Results arrive independently of what we send, so read them
+                # in their own task while the audio is streamed up
+                reader = asyncio.create_task(self._read_transcripts(ws, on_sentence))
+                try:
+                    async for chunk in audio_chunks:
+                        await ws.send_media(chunk)
+                    # Have Deepgram flush the remaining results and close the
+                    # socket, which ends the reader
+                    await ws.send_control(ListenV1ControlMessage(type="CloseStream"))
+                    await reader
+                finally:
+                    reader.cancel()
 
                 logger.info("Deepgram transcription finished")
 
@@ -49,6 +62,13 @@ class SpeechToTextService:
             logger.error(f"Deepgram transcription error: {e}")
             raise
 
+    async def _read_transcripts(self, ws, on_sentence):
+        """Hand each transcript from the socket to the sentence buffer."""
+        async for message in ws:
+            transcript = self._extract_transcript(message)
+            if transcript:
+                await self._handle_transcript(transcript, on_sentence)
+
     def _extract_transcript(self, message) -> str | None:
         """Extract transcript text from a Deepgram message."""
         try:
@@ -65,13 +85,17 @@ class SpeechToTextService:
         if not transcript.strip():
             return
 
-        logger.info(f"Transcript: {transcript}")
-        self.transcript_buffer.append(transcript)
+        logger.info("Transcript: %s", transcript)
+        self.transcript_buffer.write(transcript)
+        self.transcript_buffer.write(" ")
+        self._buffered += 1
 
         # Emit when we have a complete sentence or buffer is large
-        if transcript.rstrip().endswith((".", "!", "?")) or len(self.transcript_buffer) >= 5:
-            complete_text = " ".join(self.transcript_buffer)
-            self.transcript_buffer = []
+        if transcript[-1:] in _SENT_ENDS or self._buffered >= MAX_BUFFERED_TRANSCRIPTS:
+            complete_text = self.transcript_buffer.getvalue().strip()
+            self.transcript_buffer.seek(0)
+            self.transcript_buffer.truncate(0)
+            self._buffered = 0
             await on_sentence(complete_text)
 
 
@@ -84,18 +108,32 @@ class BatchSpeechToText:
     def __init__(self):
         self.client = DeepgramClient(api_key=settings.DEEPGRAM_API_KEY)
 
-    async def transcribe_audio(self, audio_data: bytes) -> str:
-        """Transcribe an audio chunk to text."""
+    async def transcribe_audio(self, audio_data: bytes, sample_rate: int = 16000) -> str:
+        """Transcribe a chunk of raw mono s16 PCM to text.
+
+        The format is passed as query parameters, so chunks need no WAV header.
+        Returns the stripped transcript, or "" when no speech was detected.
+        """
         try:
-            response = self.client.listen.v1.media.transcribe_file(
+            # The SDK call is blocking; run it off the event loop
+            response = await asyncio.to_thread(
+                self.client.listen.v1.media.transcribe_file,
                 request=audio_data,
                 model="nova-2",
                 language="en",
                 punctuate=True,
+                encoding="linear16",
+                # Not exposed as SDK arguments; sent as extra query parameters
+                request_options={
+                    "additional_query_parameters": {
+                        "sample_rate": sample_rate,
+                        "channels": 1,
+                    },
+                },
             )
 
             transcript = response.results.channels[0].alternatives[0].transcript
-            return transcript
+            return transcript.strip() if transcript else ""
 
         except Exception as e:
             logger.error(f"Batch transcription error: {e}")
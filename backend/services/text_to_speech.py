@@ -8,27 +8,48 @@ natural Telugu prosody, intonation, and rhythm than generic TTS engines.
 API reference: https://docs.sarvam.ai/api-reference-docs/text-to-speech
 """
 
-import base64
+import asyncio
 import logging
 
 import httpx
+import orjson
+import pybase64
 
-from config import settings
+from config import get_settings
+from utils.text import split_sentences
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 SARVAM_TTS_URL = "https://api.sarvam.ai/text-to-speech"
 
 
-class TeluguTTSService:
+class SarvamTTSService:
     """Converts Telugu text to speech using Sarvam Bulbul TTS."""
 
-    def __init__(self):
+    def __init__(self, http_client: httpx.AsyncClient | None = None):
+        # Pooled keep-alive client; pass one in to share it with other services
+        self.http_client = http_client or httpx.AsyncClient(timeout=30)
         self.api_key = settings.SARVAM_API_KEY
         self.speaker = settings.TTS_SPEAKER
         self.model = settings.TTS_MODEL
         self.language = settings.TTS_LANGUAGE
         self.pace = settings.TTS_PACE
+        self.headers = {
+            "api-subscription-key": self.api_key,
+            "Content-Type": "application/json",
+        }
+        # Voice settings never change after construction; only the text
+        # differs between requests
+        self._voice_params = {
+            "target_language_code": self.language,
+            "speaker": self.speaker,
+            "model": self.model,
+            "enable_preprocessing": True,
+            "pace": self.pace,
+            "pitch": 0,
+            "loudness": 1.5,
+        }
 
     async def synthesize_speech(self, telugu_text: str) -> bytes:
         """Convert Telugu text to WAV audio bytes via Sarvam Bulbul.
@@ -39,34 +60,22 @@ class TeluguTTSService:
         Returns:
             WAV audio bytes.
         """
-        payload = {
-            "inputs": [telugu_text],
-            "target_language_code": self.language,
-            "speaker": self.speaker,
-            "model": self.model,
-            "enable_preprocessing": True,
-            "pace": self.pace,
-            "pitch": 0,
-            "loudness": 1.5,
-        }
-
-        headers = {
-            "api-subscription-key": self.api_key,
-            "Content-Type": "application/json",
-        }
+        payload = {"inputs": [telugu_text], **self._voice_params}
 
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.post(
-                    SARVAM_TTS_URL, json=payload, headers=headers
-                )
-                response.raise_for_status()
-
-            data = response.json()
-            # Bulbul returns base64-encoded audio per input
-            audio_b64 = data["audios"][0]
-            audio_bytes = base64.b64decode(audio_b64)
-            logger.info(f"Bulbul TTS generated {len(audio_bytes)} bytes of audio")
+            response = await self.http_client.post(
+                SARVAM_TTS_URL, json=payload, headers=self.headers
+            )
+            response.raise_for_status()
+
+            # Bulbul only returns JSON with base64-encoded audio per input, so
+            # parse the raw body with orjson and decode with SIMD pybase64,
+            # dropping each intermediate copy as soon as it has been consumed
+            audio_b64 = orjson.loads(response.content)["audios"][0]
+            del response
+            audio_bytes = pybase64.b64decode(audio_b64)
+            del audio_b64
+            logger.info("Bulbul TTS generated %d bytes of audio", len(audio_bytes))
             return audio_bytes
 
         except httpx.HTTPStatusError as e:
@@ -77,3 +86,44 @@ class TeluguTTSService:
         except Exception as e:
             logger.error(f"Sarvam TTS error: {e}")
             raise
+
+    async def synthesize_speech_stream(self, telugu_text: str):
+        """Streaming variant of synthesize_speech: yield WAV audio sentence by sentence.
+
+        Bulbul's REST endpoint returns a whole clip per request, so each
+        sentence is requested concurrently and yielded in order as soon as it
+        is ready — time to first audio is one sentence's synthesis, and
+        playback of the first sentence overlaps synthesis of the rest.
+        """
+        tasks = [
+            asyncio.create_task(self.synthesize_speech(sentence))
+            for sentence in split_sentences(telugu_text)
+        ]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+# TTS backends by settings.TTS_PROVIDER
+TTS_PROVIDERS = {
+    "sarvam": SarvamTTSService,
+}
+
+# Name the rest of the app uses for the default backend
+TeluguTTSService = SarvamTTSService
+
+
+def make_tts_service(http_client: httpx.AsyncClient | None = None):
+    """Build the TTS backend selected by settings.TTS_PROVIDER."""
+    provider = settings.TTS_PROVIDER.strip().lower()
+    try:
+        service_cls = TTS_PROVIDERS[provider]
+    except KeyError:
+        raise ValueError(
+            f"Unknown TTS_PROVIDER {settings.TTS_PROVIDER!r} "
+            f"(expected one of: {', '.join(TTS_PROVIDERS)})"
+        ) from None
+    return service_cls(http_client=http_client)
@@ -0,0 +1,31 @@
+"""
+Voice Activity Detection
+========================
+Cheap in-process speech check (WebRTC VAD) on decoded PCM, so chunks that are
+only engine noise or crowd murmur skip STT, translation and TTS entirely.
+"""
+
+import webrtcvad
+
+FRAME_MS = 30             # WebRTC VAD accepts 10, 20 or 30 ms frames
+AGGRESSIVENESS = 2        # 0 (most permissive) … 3 (most aggressive)
+MIN_SPEECH_RATIO = 0.10   # chunks with fewer voiced frames count as silent
+
+
+def is_silent(pcm: bytes | bytearray | memoryview, sample_rate: int = 16000) -> bool:
+    """True when under MIN_SPEECH_RATIO of the 30 ms frames in ``pcm`` are voiced.
+
+    ``pcm`` must be mono s16 at 8, 16, 32 or 48 kHz.
+    """
+    vad = webrtcvad.Vad(AGGRESSIVENESS)
+    frame_size = sample_rate * FRAME_MS // 1000 * 2
+    frames = len(pcm) // frame_size
+    if not frames:
+        return True
+
+    with memoryview(pcm) as view:
+        voiced = sum(
+            vad.is_speech(view[start:start + frame_size], sample_rate)
+            for start in range(0, frames * frame_size, frame_size)
+        )
+    return voiced < frames * MIN_SPEECH_RATIO
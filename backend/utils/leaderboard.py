@@ -0,0 +1,43 @@
+def diff_leaderboard(prev: dict, new: dict) -> dict:
+    """Compute a compact patch that turns leaderboard ``prev`` into ``new``.
+
+    Returns an empty dict when nothing changed. Otherwise any of:
+      - fields:    top-level values that changed (everything except positions)
+      - positions: one entry per changed driver — its driver_number plus the
+                   fields that changed (the full row for a new driver)
+      - removed:   driver_numbers that dropped off the leaderboard
+      - order:     driver_numbers in the new order, sent only if it changed
+    """
+    patch = {}
+
+    fields = {
+        key: value for key, value in new.items()
+        if key != "positions" and prev.get(key) != value
+    }
+    if fields:
+        patch["fields"] = fields
+
+    prev_rows = {row["driver_number"]: row for row in prev.get("positions", [])}
+    new_rows = new.get("positions", [])
+
+    changed = []
+    for row in new_rows:
+        old = prev_rows.get(row["driver_number"])
+        if old is None:
+            changed.append(row)
+            continue
+        delta = {key: value for key, value in row.items() if old.get(key) != value}
+        if delta:
+            changed.append({"driver_number": row["driver_number"], **delta})
+    if changed:
+        patch["positions"] = changed
+
+    new_order = [row["driver_number"] for row in new_rows]
+    present = set(new_order)
+    removed = [num for num in prev_rows if num not in present]
+    if removed:
+        patch["removed"] = removed
+    if new_order != list(prev_rows):
+        patch["order"] = new_order
+
+    return patch
@@ -0,0 +1,50 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Small bounded LRU mapping.
+
+    Evicts least-recently-used entries once ``maxsize`` entries are held or,
+    if ``max_bytes`` is set, once the summed ``sizeof(value)`` exceeds it.
+    """
+
+    def __init__(self, maxsize: int, max_bytes: int | None = None, sizeof=len):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._data: OrderedDict = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key, default=None):
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return default
+        return self._data[key]
+
+    def put(self, key, value):
+        if key in self._data:
+            self._discard(key)
+        self._data[key] = value
+        if self.max_bytes is not None:
+            self._bytes += self.sizeof(value)
+        while self._data and (
+            len(self._data) > self.maxsize
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            self._discard(next(iter(self._data)))
+
+    def clear(self):
+        self._data.clear()
+        self._bytes = 0
+
+    def _discard(self, key):
+        value = self._data.pop(key)
+        if self.max_bytes is not None:
+            self._bytes -= self.sizeof(value)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
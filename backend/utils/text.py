@@ -0,0 +1,16 @@
+import hashlib
+import re
+
+# Split after sentence-ending punctuation (incl. the Devanagari danda)
+SENTENCE_BREAK = re.compile(r"(?<=[.!?।])\s+")
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split text into sentences for per-sentence synthesis."""
+    return [part for part in (p.strip() for p in SENTENCE_BREAK.split(text)) if part]
+
+
+def commentary_key(english_text: str) -> bytes:
+    """Fixed-size cache key for a commentary line: lowercased, whitespace collapsed."""
+    normalized = " ".join(english_text.lower().split())
+    return hashlib.blake2s(normalized.encode(), digest_size=16).digest()
@@ -5,7 +5,7 @@ import { useAudioPlayer } from "@/hooks/useAudioPlayer";
 
 interface AudioPlayerProps {
   isConnected: boolean;
-  setOnAudioChunk: (callback: (audio: string) => void) => void;
+  setOnAudioChunk: (callback: (audio: ArrayBuffer) => void) => void;
 }
 
 export default function AudioPlayer({
@@ -4,7 +4,7 @@ import { useRef, useState, useCallback } from "react";
 
 export function useAudioPlayer() {
   const audioRef = useRef<HTMLAudioElement | null>(null);
-  const queueRef = useRef<string[]>([]); // base64 audio strings
+  const queueRef = useRef<ArrayBuffer[]>([]); // raw audio bytes
   const isPlayingRef = useRef(false);
 
   const [isPlaying, setIsPlaying] = useState(false);
@@ -18,14 +18,8 @@ export function useAudioPlayer() {
       return;
     }
 
-    const base64Audio = queueRef.current.shift()!;
-    const binaryStr = atob(base64Audio);
-    const bytes = new Uint8Array(binaryStr.length);
-    for (let i = 0; i < binaryStr.length; i++) {
-      bytes[i] = binaryStr.charCodeAt(i);
-    }
-
-    const blob = new Blob([bytes], { type: "audio/mpeg" });
+    const audioData = queueRef.current.shift()!;
+    const blob = new Blob([audioData], { type: "audio/mpeg" });
     const url = URL.createObjectURL(blob);
 
     const audio = audioRef.current!;
@@ -53,14 +47,14 @@ export function useAudioPlayer() {
   }, [volume]);
 
   const handleAudioChunk = useCallback(
-    (base64Audio: string) => {
+    (audioData: ArrayBuffer) => {
       if (!isEnabled) return;
 
       console.log(
-        `[AudioPlayer] Received chunk (${Math.round(base64Audio.length / 1024)} KB)`
+        `[AudioPlayer] Received chunk (${Math.round(audioData.byteLength / 1024)} KB)`
       );
 
-      queueRef.current.push(base64Audio);
+      queueRef.current.push(audioData);
 
       if (!isPlayingRef.current) {
         playNext();
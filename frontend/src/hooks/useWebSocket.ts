@@ -25,8 +25,55 @@ interface DriverPosition {
   last_lap_time: string;
 }
 
-interface AudioChunk {
-  audio: string; // base64
+// A changed row: always its driver_number, plus the fields that changed
+// (every field for a driver new to the leaderboard)
+type DriverPositionPatch = Partial<DriverPosition> & { driver_number: number };
+
+// Changes since the previous leaderboard (see backend utils/leaderboard.py)
+interface LeaderboardPatch {
+  fields?: Partial<Omit<LeaderboardData, "positions">>;
+  positions?: DriverPositionPatch[];
+  removed?: number[];
+  order?: number[];
+}
+
+function isCompleteRow(
+  row: DriverPositionPatch
+): row is DriverPositionPatch & DriverPosition {
+  return (
+    row.position !== undefined &&
+    row.driver_name !== undefined &&
+    row.team !== undefined &&
+    row.gap !== undefined &&
+    row.last_lap_time !== undefined
+  );
+}
+
+function applyLeaderboardPatch(
+  prev: LeaderboardData,
+  patch: LeaderboardPatch
+): LeaderboardData {
+  const rows = new Map<number, DriverPosition>();
+  prev.positions.forEach((p) => {
+    if (p.driver_number !== undefined) rows.set(p.driver_number, p);
+  });
+  patch.removed?.forEach((num) => rows.delete(num));
+  patch.positions?.forEach((delta) => {
+    const row = rows.get(delta.driver_number);
+    if (row) {
+      rows.set(delta.driver_number, { ...row, ...delta });
+    } else if (isCompleteRow(delta)) {
+      rows.set(delta.driver_number, delta);
+    }
+  });
+  const order = patch.order ?? Array.from(rows.keys());
+  return {
+    ...prev,
+    ...patch.fields,
+    positions: order
+      .map((num) => rows.get(num))
+      .filter((p): p is DriverPosition => p !== undefined),
+  };
 }
 
 // English + Telugu commentary pair — displayed side by side on the frontend
@@ -45,11 +92,11 @@ export function useWebSocket() {
   const socketRef = useRef<Socket | null>(null);
 
   const [leaderboard, setLeaderboard] = useState<LeaderboardData | null>(null);
-  const [audioChunks, setAudioChunks] = useState<string[]>([]);
+  const [audioChunks, setAudioChunks] = useState<ArrayBuffer[]>([]);
   const [commentaryFeed, setCommentaryFeed] = useState<CommentaryText[]>([]);
   const [raceEvents, setRaceEvents] = useState<RaceEvent[]>([]);
 
-  const onAudioChunkRef = useRef<((audio: string) => void) | null>(null);
+  const onAudioChunkRef = useRef<((audio: ArrayBuffer) => void) | null>(null);
 
   useEffect(() => {
     const socket = io(WS_URL, {
@@ -73,12 +120,25 @@ export function useWebSocket() {
       setLeaderboard(data);
     });
 
-    socket.on("audio_chunk", (data: AudioChunk) => {
+    // Patches need a snapshot to apply to; one is sent on connect
+    socket.on("leaderboard_patch", (patch: LeaderboardPatch) => {
+      setLeaderboard((prev) => (prev ? applyLeaderboardPatch(prev, patch) : prev));
+    });
+
+    // Audio arrives as binary attachments (raw bytes, no base64)
+    const handleAudio = (data: ArrayBuffer) => {
       console.log(
-        `[WebSocket] audio_chunk received (${Math.round(data.audio.length / 1024)} KB)`
+        `[WebSocket] audio_chunk received (${Math.round(data.byteLength / 1024)} KB)`
       );
-      setAudioChunks((prev) => [...prev, data.audio]);
-      onAudioChunkRef.current?.(data.audio);
+      setAudioChunks((prev) => [...prev, data]);
+      onAudioChunkRef.current?.(data);
+    };
+
+    socket.on("audio_chunk", handleAudio);
+
+    // Several chunks coalesced by the server into one emit, in play order
+    socket.on("audio_chunks_batch", (batch: ArrayBuffer[]) => {
+      batch.forEach(handleAudio);
     });
 
     // Telugu + English text pair — keep the last 50 entries for display
@@ -98,7 +158,7 @@ export function useWebSocket() {
   }, []);
 
   const setOnAudioChunk = useCallback(
-    (callback: (audio: string) => void) => {
+    (callback: (audio: ArrayBuffer) => void) => {
       onAudioChunkRef.current = callback;
     },
     []